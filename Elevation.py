@@ -1,6 +1,11 @@
-import rasterio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import namedtuple
+from dem_cache import TiledDEM, DEFAULT_PYRAMID_LEVELS, downsample_strip
+from cache import LRUCache
+from lazy_imports import lazy_import
 import numpy as np
-import folium
 
 elevation_ranges = {
             'Very Low <50': (float('-inf'), 50),
@@ -10,33 +15,441 @@ elevation_ranges = {
             'Very High <700': (700, float('inf'))
         }
 
+def dem_signature(dem_file):
+    """Size/mtime tag of the DEM, so cached elevations are dropped when it changes"""
+    if not os.path.exists(dem_file):
+        return None
+    stat = os.stat(dem_file)
+    return f"{stat.st_size}:{stat.st_mtime}"
 
-def get_elevation(dem_file, lat, lng):
-        """Get elevation for a specific coordinate from DEM with error handling"""
-        try:
-            with rasterio.open(dem_file) as src:
-                # Transform coordinates to pixel coordinates
-                row, col = src.index(lng, lat)
+
+# Grid metadata of a pyramid level read with 2**n downsampling from the GeoTIFF
+DEMLevel = namedtuple('DEMLevel', ['transform', 'height', 'width', 'nodata', 'res', 'block_shapes'])
+
+
+class DEMSampler:
+    """Keeps the DEM open and samples elevations with small windowed reads.
+    When a fresh tile cache from dem_cache.py exists, reads are served from it
+    and the source GeoTIFF is never decoded. Coarser pyramid levels serve large
+    search areas at a bounded pixel count."""
+
+    def __init__(self, dem_file, cache_dir=None, max_level=DEFAULT_PYRAMID_LEVELS,
+                 max_workers=None, parallel_threshold=5000, elevation_cache_size=200000):
+        self.dem_file = dem_file
+        self.cache_dir = cache_dir
+        self.max_level = max_level
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.parallel_threshold = parallel_threshold  # minimum batch size for threaded reads
+        self._src = None
+        self._level_tiles = {}
+        self._last_window = None
+        self._executor = None
+        self._thread_local = threading.local()
+        self._thread_handles = []
+        self._handles_lock = threading.Lock()
+        
+        # (row, col) -> (elevation, elevation_class); nearby coordinates share a pixel entry
+        self.elevation_cache = LRUCache(
+            maxsize=elevation_cache_size,
+            path=os.path.join(cache_dir, "elevation_lru.json") if cache_dir else None,
+            tag=dem_signature(dem_file)
+        )
+
+    @property
+    def src(self):
+        """Open the DEM on first use and reuse the handle afterwards"""
+        if self._src is None or self._src.closed:
+            self._src = lazy_import("rasterio").open(self.dem_file)
+        return self._src
+
+    def level_tiles(self, level=0):
+        """The memory-mapped tiles of a pyramid level, or None when missing or stale"""
+        if level not in self._level_tiles:
+            tiles = None
+            if self.cache_dir:
+                tiles = TiledDEM.open_if_fresh(self.dem_file, self.cache_dir, level=level)
+            self._level_tiles[level] = tiles
+        return self._level_tiles[level]
+
+    @property
+    def tiles(self):
+        """The full-resolution tile cache, or None"""
+        return self.level_tiles(0)
+
+    @property
+    def grid(self):
+        """Raster grid metadata (transform, height, width, nodata, res, block_shapes)"""
+        tiles = self.tiles
+        return tiles if tiles is not None else self.src
+
+    def level_grid(self, level=0):
+        """Grid metadata for a pyramid level; level n is downsampled by 2**n"""
+        tiles = self.level_tiles(level)
+        if tiles is not None:
+            return tiles
+        base = self.grid
+        if level == 0:
+            return base
+        
+        factor = 2 ** level
+        return DEMLevel(
+            transform=base.transform * lazy_import("rasterio.transform").Affine.scale(factor),
+            height=-(-base.height // factor),
+            width=-(-base.width // factor),
+            nodata=base.nodata,
+            res=(base.res[0] * factor, base.res[1] * factor),
+            block_shapes=base.block_shapes
+        )
+
+    def choose_level(self, radius_m, pixel_budget):
+        """Coarsest pyramid level that still leaves pixel_budget pixels inside the search circle"""
+        if not pixel_budget:
+            return 0
+        
+        radius_px = radius_m / 111320 / self.grid.res[0]
+        level = 0
+        while level < self.max_level and np.pi * (radius_px / 2 ** (level + 1)) ** 2 >= pixel_budget:
+            level += 1
+        return level
+
+    def thread_src(self):
+        """Dataset handle private to the calling worker thread; GDAL handles are not thread-safe"""
+        src = getattr(self._thread_local, 'src', None)
+        if src is None or src.closed:
+            src = lazy_import("rasterio").open(self.dem_file)
+            self._thread_local.src = src
+            with self._handles_lock:
+                self._thread_handles.append(src)
+        return src
+
+    @property
+    def executor(self):
+        """Long-lived worker pool, so per-thread handles survive between batches"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix='dem-reader')
+        return self._executor
+
+    def close(self):
+        """Persist the elevation cache and release handles, worker pool and tile caches"""
+        self.elevation_cache.save()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._handles_lock:
+            for src in self._thread_handles:
+                src.close()
+            self._thread_handles = []
+        self._thread_local = threading.local()
+        
+        if self._src is not None and not self._src.closed:
+            self._src.close()
+        self._src = None
+        self._level_tiles = {}
+        self._last_window = None
+
+    def read(self, window, level=0):
+        """Read an in-bounds window of the elevation band at a pyramid level"""
+        tiles = self.level_tiles(level)
+        if tiles is not None:
+            return tiles.read(window)
+        if level == 0:
+            return self.src.read(1, window=window)
+        
+        # Averaged read from the GeoTIFF (matching the tile cache's overviews);
+        # GDAL uses its internal overviews when present
+        Window = lazy_import("rasterio.windows").Window
+        average = lazy_import("rasterio.enums").Resampling.average
+        src = self.src
+        factor = 2 ** level
+        row_off, col_off = int(window.row_off), int(window.col_off)
+        height, width = int(window.height), int(window.width)
+        
+        # Whole factor-sized blocks and the raster's partial last row/column are read apart,
+        # so GDAL never stretches a clipped edge strip over full-size output pixels
+        full_rows = min(height, (src.height - row_off * factor) // factor)
+        full_cols = min(width, (src.width - col_off * factor) // factor)
+        data = np.empty((height, width), dtype=src.dtypes[0])
+        for rows in (slice(0, full_rows), slice(full_rows, height)):
+            for cols in (slice(0, full_cols), slice(full_cols, width)):
+                if rows.stop <= rows.start or cols.stop <= cols.start:
+                    continue
+                source_row, source_col = (row_off + rows.start) * factor, (col_off + cols.start) * factor
+                source_window = Window(source_col, source_row,
+                                       min((cols.stop - cols.start) * factor, src.width - source_col),
+                                       min((rows.stop - rows.start) * factor, src.height - source_row))
+                data[rows, cols] = src.read(1, window=source_window,
+                                            out_shape=(rows.stop - rows.start, cols.stop - cols.start),
+                                            resampling=average)
+        return data
+
+    def read_window_cached(self, window, level=0):
+        """
+        Read a window together with its pixel-centre (lngs, lats) grids, reusing the
+        last window read. A window contained in the cached one is served by slicing;
+        a window that contains it (a larger radius around the same centre) only reads
+        the missing strips around the cached data. A cached window at a finer level is
+        first averaged down when both levels come from the tile cache; moving to a
+        finer level always reads afresh.
+        """
+        Window = lazy_import("rasterio.windows").Window
+        row_off, col_off = int(window.row_off), int(window.col_off)
+        height, width = int(window.height), int(window.width)
+        cached = self._last_window
+        if cached is not None and cached['level'] < level:
+            cached = self._coarsen_window(cached, level)
+        
+        if cached is not None and cached['level'] == level:
+            cached_height, cached_width = cached['data'].shape
+            top = cached['row_off'] - row_off
+            left = cached['col_off'] - col_off
+            bottom = top + cached_height
+            right = left + cached_width
+            
+            if top <= 0 and left <= 0 and bottom >= height and right >= width:
+                data = cached['data'][-top:-top + height, -left:-left + width]
+                return (data,) + self.window_centres(window, level)
+            
+            if top >= 0 and left >= 0 and bottom <= height and right <= width:
+                data = np.empty((height, width), dtype=cached['data'].dtype)
+                data[top:bottom, left:right] = cached['data']
                 
-                # Check if the coordinates are within the bounds of the raster
-                if 0 <= row < src.height and 0 <= col < src.width:
-                    # Read the elevation value
-                    elevation = src.read(1)[row, col]
-                    
-                    # Handle nodata values
-                    if elevation == src.nodata:
-                        return 0, 'Unknown'
-                    
-                    # Classify elevation
-                    elevation_class = classify_elevation(float(elevation))
-                    
-                    return float(elevation), elevation_class
+                # Full-width strips above and below, then the gaps beside the cached block
+                if top > 0:
+                    data[:top, :] = self.read(Window(col_off, row_off, width, top), level)
+                if bottom < height:
+                    data[bottom:, :] = self.read(Window(col_off, row_off + bottom, width, height - bottom), level)
+                if left > 0:
+                    data[top:bottom, :left] = self.read(Window(col_off, row_off + top, left, cached_height), level)
+                if right < width:
+                    data[top:bottom, right:] = self.read(
+                        Window(col_off + right, row_off + top, width - right, cached_height), level)
+                return self._cache_window(window, level, data)
+        
+        return self._cache_window(window, level, self.read(window, level))
+
+    def _cache_window(self, window, level, data):
+        """Remember a window's data for read_window_cached; coordinate grids are rebuilt per call"""
+        self._last_window = {
+            'level': level,
+            'row_off': int(window.row_off),
+            'col_off': int(window.col_off),
+            'data': data
+        }
+        return (data,) + self.window_centres(window, level)
+
+    def _coarsen_window(self, cached, level):
+        """
+        The cached window averaged down to a coarser level exactly as dem_cache.py builds
+        its pyramid, trimmed to whole blocks; None when either level is read from the
+        GeoTIFF (GDAL's resampling would not match) or no whole block is cached
+        """
+        if self.level_tiles(cached['level']) is None or self.level_tiles(level) is None:
+            return None
+        
+        factor = 2 ** (level - cached['level'])
+        cached_height, cached_width = cached['data'].shape
+        row_start = -(-cached['row_off'] // factor) * factor
+        col_start = -(-cached['col_off'] // factor) * factor
+        row_stop = (cached['row_off'] + cached_height) // factor * factor
+        col_stop = (cached['col_off'] + cached_width) // factor * factor
+        if row_stop <= row_start or col_stop <= col_start:
+            return None
+        
+        data = cached['data'][row_start - cached['row_off']:row_stop - cached['row_off'],
+                              col_start - cached['col_off']:col_stop - cached['col_off']]
+        nodata = self.level_grid(cached['level']).nodata
+        fill_value = nodata if nodata is not None else 0
+        for _ in range(level - cached['level']):
+            data = downsample_strip(data, nodata, fill_value)
+        return {'level': level, 'row_off': row_start // factor, 'col_off': col_start // factor, 'data': data}
+
+    def window_centres(self, window, level=0):
+        """Pixel-centre (lngs, lats) grids of a window at a pyramid level"""
+        transform = lazy_import("rasterio.windows").transform(window, self.level_grid(level).transform)
+        return pixel_centres(transform, np.arange(int(window.height))[:, None], np.arange(int(window.width))[None, :])
+
+    def read_pixel(self, row, col):
+        """Read a single DEM pixel, or None when it lies outside the raster"""
+        grid = self.grid
+        if 0 <= row < grid.height and 0 <= col < grid.width:
+            # Only the 1x1 window is read; the containing block/tile stays cached
+            return self.read(lazy_import("rasterio.windows").Window(col, row, 1, 1))[0, 0]
+        return None
+
+    def pixel_indices(self, lats, lngs, level=0):
+        """Convert coordinate arrays to pixel rows/cols with one vectorized affine transform"""
+        inverse = ~self.level_grid(level).transform
+        lngs = np.asarray(lngs, dtype=float)
+        lats = np.asarray(lats, dtype=float)
+        cols = np.floor(inverse.a * lngs + inverse.b * lats + inverse.c)
+        rows = np.floor(inverse.d * lngs + inverse.e * lats + inverse.f)
+        
+        # Non-finite coordinates are pushed out of bounds
+        finite = np.isfinite(rows) & np.isfinite(cols)
+        rows = np.where(finite, rows, -1).astype(np.int64)
+        cols = np.where(finite, cols, -1).astype(np.int64)
+        return rows, cols
+
+    def pixel_index(self, lat, lng, level=0):
+        """Pixel (row, col) containing a single coordinate"""
+        rows, cols = self.pixel_indices([lat], [lng], level)
+        return int(rows[0]), int(cols[0])
+
+    def group_by_block(self, rows, cols):
+        """Group in-bounds pixel indices by the DEM block that contains them.
+        Returns a list of (window, point_indices) pairs, one per block."""
+        grid = self.grid
+        inside = np.flatnonzero((rows >= 0) & (rows < grid.height) & (cols >= 0) & (cols < grid.width))
+        if len(inside) == 0:
+            return []
+        
+        block_h, block_w = grid.block_shapes[0]
+        blocks_per_row = -(-grid.width // block_w)
+        block_ids = (rows[inside] // block_h) * blocks_per_row + cols[inside] // block_w
+        
+        order = np.argsort(block_ids, kind='stable')
+        sorted_ids = block_ids[order]
+        boundaries = np.flatnonzero(np.diff(sorted_ids)) + 1
+        
+        Window = lazy_import("rasterio.windows").Window
+        groups = []
+        for indices in np.split(inside[order], boundaries):
+            row_off = (rows[indices[0]] // block_h) * block_h
+            col_off = (cols[indices[0]] // block_w) * block_w
+            window = Window(col_off, row_off,
+                            min(block_w, grid.width - col_off),
+                            min(block_h, grid.height - row_off))
+            groups.append((window, indices))
+        return groups
+
+    def read_block_values(self, window, rows, cols, threaded=False):
+        """Read one block and return the values at the given absolute pixel indices"""
+        if self.tiles is None and threaded:
+            block = self.thread_src().read(1, window=window)
+        else:
+            block = self.read(window)
+        return block[rows - int(window.row_off), cols - int(window.col_off)]
+
+    def sample_pixels(self, rows, cols):
+        """Read the DEM at arrays of pixel indices; returns (values, valid) arrays.
+        Each block is read once, on the thread pool for large batches."""
+        count = len(rows)
+        elevations = np.zeros(count, dtype=float)
+        valid = np.zeros(count, dtype=bool)
+        nodata = self.grid.nodata
+        groups = self.group_by_block(rows, cols)
+        
+        if self.max_workers > 1 and len(groups) > 1 and count >= self.parallel_threshold:
+            # Blocks are decoded concurrently; GDAL releases the GIL while reading
+            results = self.executor.map(
+                lambda group: self.read_block_values(group[0], rows[group[1]], cols[group[1]], threaded=True),
+                groups)
+        else:
+            results = (self.read_block_values(window, rows[indices], cols[indices])
+                       for window, indices in groups)
+        
+        # Results are scattered back by index, so input order is preserved
+        for (window, indices), values in zip(groups, results):
+            elevations[indices] = values
+            valid[indices] = True if nodata is None else values != nodata
+        
+        valid &= np.isfinite(elevations)
+        elevations[~valid] = 0
+        return elevations, valid
+
+    def get_elevations(self, lats, lngs):
+        """Batch elevation lookup for whole coordinate lists.
+        Returns (elevations, elevation_classes) arrays with nodata and out-of-bounds
+        points set to 0 / 'Unknown'. Pixels already in the elevation cache skip the DEM."""
+        count = len(lats)
+        elevations = np.zeros(count, dtype=float)
+        elevation_classes = np.full(count, 'Unknown', dtype=object)
+        if not count:
+            return elevations, elevation_classes
+        
+        try:
+            rows, cols = self.pixel_indices(lats, lngs)
+            
+            # Points sharing a pixel are looked up, sampled and cached once
+            pixels, inverse = np.unique(np.column_stack((rows, cols)), axis=0, return_inverse=True)
+            inverse = inverse.reshape(-1)
+            keys = list(map(tuple, pixels.tolist()))
+            pixel_elevations = np.zeros(len(keys), dtype=float)
+            pixel_classes = np.full(len(keys), 'Unknown', dtype=object)
+            
+            missing = []
+            for index, key in enumerate(keys):
+                cached = self.elevation_cache.get(key)
+                if cached is None:
+                    missing.append(index)
                 else:
-                    return 0, 'Unknown'
+                    pixel_elevations[index], pixel_classes[index] = cached
+            
+            if missing:
+                missing = np.array(missing)
+                values, valid = self.sample_pixels(pixels[missing, 0], pixels[missing, 1])
+                classes = classify_elevations(values, valid)
+                pixel_elevations[missing] = values
+                pixel_classes[missing] = classes
+                for index, elevation, elevation_class in zip(missing, values, classes):
+                    self.elevation_cache.put(keys[index], (float(elevation), elevation_class))
+            
+            elevations[:] = pixel_elevations[inverse]
+            elevation_classes[:] = pixel_classes[inverse]
+        except Exception as e:
+            print(f"Error reading elevations for {count} coordinates: {str(e)}")
+            elevations[:] = 0
+            elevation_classes[:] = 'Unknown'
+        
+        return elevations, elevation_classes
+
+    def get_elevation(self, lat, lng):
+        """Get elevation for a specific coordinate from DEM with error handling"""
+        try:
+            # Transform coordinates to pixel coordinates
+            row, col = self.pixel_index(lat, lng)
+            cached = self.elevation_cache.get((row, col))
+            if cached is not None:
+                return cached
+            
+            elevation = self.read_pixel(row, col)
+
+            # Handle out-of-bounds and nodata values
+            if elevation is None or elevation == self.grid.nodata or not np.isfinite(elevation):
+                result = (0, 'Unknown')
+            else:
+                elevation = float(elevation)
+                result = (elevation, classify_elevation(elevation))
+            
+            self.elevation_cache.put((row, col), result)
+            return result
         except Exception as e:
             print(f"Error reading elevation for coordinates ({lat}, {lng}): {str(e)}")
             return 0, 'Unknown'
 
+
+def get_elevation(dem_sampler, lat, lng):
+        """Get elevation for a specific coordinate through the shared DEM sampler"""
+        return dem_sampler.get_elevation(lat, lng)
+
+def get_elevations(dem_sampler, lats, lngs):
+        """Get elevations and elevation classes for arrays of coordinates"""
+        return dem_sampler.get_elevations(lats, lngs)
+
+def classify_elevations(elevations, valid=None):
+        """Vectorized classify_elevation; entries where valid is False become 'Unknown'"""
+        elevations = np.asarray(elevations, dtype=float)
+        labels = np.array(list(elevation_ranges.keys()) + ['Unknown'], dtype=object)
+        upper_bounds = [max_val for _, max_val in list(elevation_ranges.values())[:-1]]
+        
+        classes = np.digitize(elevations, upper_bounds)
+        unknown = ~np.isfinite(elevations)
+        if valid is not None:
+            unknown |= ~np.asarray(valid, dtype=bool)
+        classes[unknown] = len(labels) - 1
+        return labels[classes]
+
 def classify_elevation(elevation):
         """Classify elevation into five categories with error handling"""
         try:
@@ -53,8 +466,19 @@ def classify_elevation(elevation):
 
 
 
+def zone_overlay_image(zone_grid, zone_names, zone_colors):
+        """Colour a zone index grid into an RGBA image; cells of -1 stay transparent"""
+        # The extra last palette row is transparent, so index -1 maps onto it
+        palette = np.zeros((len(zone_names) + 1, 4), dtype=np.uint8)
+        for zone_index, zone_name in enumerate(zone_names):
+            color = zone_colors[zone_name].lstrip('#')
+            palette[zone_index] = [int(color[i:i + 2], 16) for i in (0, 2, 4)] + [255]
+        return palette[zone_grid]
+
+
 def generate_elevation_map(self):
         """Generate comprehensive elevation zone map with places"""
+        folium = lazy_import("folium")
         try:
             # Get zone data
             zone_data = self.divide_elevation_zones()
@@ -84,25 +508,35 @@ def generate_elevation_map(self):
                     'Zone 5 (Highest)': '#d73027'
                 }
                 
-                # Create feature groups for zones and places
-                zone_layers = {}
-                for zone_name in zone_colors.keys():
-                    zone_layers[zone_name] = folium.FeatureGroup(name=f"Elevation {zone_name}")
-                
+                zone_names = zone_data['zone_names']
                 places_layer = folium.FeatureGroup(name='Places')
+                zone_layers = {}
                 
-                # Add zone markers
-                for zone_name, coordinates in zone_data['coordinates'].items():
-                    for coord in coordinates:
+                if getattr(self, 'elevation_map_mode', 'overlay') == 'markers':
+                    # One marker per DEM pixel; only practical for small radii
+                    for zone_name in zone_colors.keys():
+                        zone_layers[zone_name] = folium.FeatureGroup(name=f"Elevation {zone_name}")
+                    
+                    for lat, lng, elevation, label in zip(zone_data['lats'], zone_data['lngs'],
+                                                          zone_data['elevations'], zone_data['labels']):
+                        zone_name = zone_names[label]
                         folium.CircleMarker(
-                            location=[coord['lat'], coord['lng']],
+                            location=[float(lat), float(lng)],
                             radius=3,
                             color=zone_colors[zone_name],
                             fill=True,
                             fill_color=zone_colors[zone_name],
                             fill_opacity=0.7,
-                            popup=f"{zone_name}<br>Elevation: {coord['elevation']:.1f}m"
+                            popup=f"{zone_name}<br>Elevation: {elevation:.1f}m"
                         ).add_to(zone_layers[zone_name])
+                else:
+                    # Single georeferenced image; size is independent of the pixel count
+                    zone_layers['overlay'] = folium.raster_layers.ImageOverlay(
+                        image=zone_overlay_image(zone_data['zone_grid'], zone_names, zone_colors),
+                        bounds=zone_data['bounds'],
+                        opacity=0.7,
+                        name='Elevation Zones'
+                    )
                 
                 # Add place markers
                 for place in self.filtered_places:
@@ -175,74 +609,114 @@ def generate_elevation_map(self):
         return None
 
 
-def divide_elevation_zones(dem_file, user_lat, user_lng, current_radius):
+def valid_elevation_mask(values, nodata):
+    """Boolean mask of DEM values that are finite and not nodata"""
+    valid = np.isfinite(values)
+    if nodata is not None:
+        valid &= values != nodata
+    return valid
+
+
+def pixel_centres(transform, rows, cols):
+    """Vectorized equivalent of src.xy: returns (lngs, lats) of pixel centres"""
+    cols = np.asarray(cols) + 0.5
+    rows = np.asarray(rows) + 0.5
+    lngs = transform.a * cols + transform.b * rows + transform.c
+    lats = transform.d * cols + transform.e * rows + transform.f
+    return lngs, lats
+
+
+def divide_elevation_zones(dem_sampler, user_lat, user_lng, current_radius, pixel_budget=None):
     """
     Divides the region within the search radius into 5 elevation zones based on actual elevation data.
-    Returns a dictionary with zone boundaries and associated coordinates.
+    Only the bounding window of the search circle is read from the DEM, at the coarsest
+    pyramid level that still gives at least pixel_budget samples inside the circle.
+    Returns a dictionary with zone boundaries, per-pixel coordinate/elevation/zone
+    arrays and per-zone statistics.
     """
     try:
-        with rasterio.open(dem_file) as src:
-            center_point = (user_lng, user_lat)
-            radius_degrees = current_radius / 111320  # Convert meters to approximate degrees
-            
-            center_px = src.index(*center_point)
-            radius_px = int(radius_degrees / src.res[0])  # Convert radius to pixels
-            
-            rows, cols = np.ogrid[-center_px[0]:src.height-center_px[0],
-                                -center_px[1]:src.width-center_px[1]]
-            mask = rows*rows + cols*cols <= radius_px*radius_px
-            
-            elevation_data = src.read(1)
-            masked_elevations = elevation_data[mask]
-            valid_elevations = masked_elevations[masked_elevations != src.nodata]
-            
-            if len(valid_elevations) == 0:
-                raise ValueError("No valid elevation data found in the specified region")
-            
-            percentiles = np.percentile(valid_elevations, [20, 40, 60, 80])
-            
-            zones = {
-                'Zone 1 (Lowest)': (float(np.min(valid_elevations)), float(percentiles[0])),
-                'Zone 2': (float(percentiles[0]), float(percentiles[1])),
-                'Zone 3': (float(percentiles[1]), float(percentiles[2])),
-                'Zone 4': (float(percentiles[2]), float(percentiles[3])),
-                'Zone 5 (Highest)': (float(percentiles[3]), float(np.max(valid_elevations)))
-            }
-            
-            zone_coordinates = {zone_name: [] for zone_name in zones.keys()}
-            
-            rows, cols = np.where(mask)
-            for row, col in zip(rows, cols):
-                elevation = elevation_data[row, col]
-                if elevation != src.nodata:
-                    lng, lat = src.xy(row, col)
-                    
-                    for zone_name, (min_elev, max_elev) in zones.items():
-                        if min_elev <= elevation <= max_elev:
-                            zone_coordinates[zone_name].append({
-                                'lat': lat,
-                                'lng': lng,
-                                'elevation': float(elevation)
-                            })
-                            break
-            
-            zone_stats = {}
-            for zone_name, coordinates in zone_coordinates.items():
-                if coordinates:
-                    elevations = [coord['elevation'] for coord in coordinates]
-                    zone_stats[zone_name] = {
-                        'min_elevation': min(elevations),
-                        'max_elevation': max(elevations),
-                        'mean_elevation': sum(elevations) / len(elevations),
-                        'point_count': len(coordinates)
-                    }
-            
-            return {
-                'zones': zones,
-                'coordinates': zone_coordinates,
-                'statistics': zone_stats
-            }
-            
+        level = dem_sampler.choose_level(current_radius, pixel_budget)
+        grid = dem_sampler.level_grid(level)
+        radius_degrees = current_radius / 111320  # Convert meters to approximate degrees
+        
+        center_row, center_col = dem_sampler.pixel_index(user_lat, user_lng, level)
+        radius_px = int(radius_degrees / grid.res[0])  # Convert radius to pixels
+        
+        # Bounding window of the search circle, clipped to the raster
+        row_start = max(center_row - radius_px, 0)
+        row_stop = min(center_row + radius_px + 1, grid.height)
+        col_start = max(center_col - radius_px, 0)
+        col_stop = min(center_col + radius_px + 1, grid.width)
+        if row_start >= row_stop or col_start >= col_stop:
+            raise ValueError("The search area lies outside the DEM")
+        
+        windows = lazy_import("rasterio.windows")
+        window = windows.Window(col_start, row_start, col_stop - col_start, row_stop - row_start)
+        # Re-searches around the same centre reuse the previously read window
+        elevation_data, window_lngs, window_lats = dem_sampler.read_window_cached(window, level)
+        
+        # Circular mask in window coordinates
+        rows, cols = np.ogrid[row_start - center_row:row_stop - center_row,
+                              col_start - center_col:col_stop - center_col]
+        mask = rows*rows + cols*cols <= radius_px*radius_px
+        
+        # Pixels inside the circle that carry valid elevation data
+        inside = mask & valid_elevation_mask(elevation_data, grid.nodata)
+        rows, cols = np.nonzero(inside)
+        elevations = elevation_data[rows, cols].astype(float)
+        
+        if len(elevations) == 0:
+            raise ValueError("No valid elevation data found in the specified region")
+        
+        percentiles = np.percentile(elevations, [20, 40, 60, 80])
+        min_elevation = float(elevations.min())
+        max_elevation = float(elevations.max())
+        
+        zones = {
+            'Zone 1 (Lowest)': (min_elevation, float(percentiles[0])),
+            'Zone 2': (float(percentiles[0]), float(percentiles[1])),
+            'Zone 3': (float(percentiles[1]), float(percentiles[2])),
+            'Zone 4': (float(percentiles[2]), float(percentiles[3])),
+            'Zone 5 (Highest)': (float(percentiles[3]), max_elevation)
+        }
+        zone_names = list(zones.keys())
+        
+        # Zone index per pixel; right=True keeps boundary values in the lower zone
+        labels = np.digitize(elevations, percentiles, right=True).astype(np.int8)
+        
+        # Pixel centres of the masked pixels come from the cached window grids
+        lngs = window_lngs[rows, cols]
+        lats = window_lats[rows, cols]
+        
+        zone_stats = {}
+        for zone_index, zone_name in enumerate(zone_names):
+            zone_elevations = elevations[labels == zone_index]
+            if len(zone_elevations):
+                zone_stats[zone_name] = {
+                    'min_elevation': float(zone_elevations.min()),
+                    'max_elevation': float(zone_elevations.max()),
+                    'mean_elevation': float(zone_elevations.mean()),
+                    'point_count': int(len(zone_elevations))
+                }
+        
+        # Zone index grid of the window for raster rendering (-1 outside the circle/nodata)
+        zone_grid = np.full(elevation_data.shape, -1, dtype=np.int8)
+        zone_grid[rows, cols] = labels
+        west, south, east, north = windows.bounds(window, grid.transform)
+        
+        return {
+            'zones': zones,
+            'zone_names': zone_names,
+            'level': level,
+            'zone_grid': zone_grid,
+            'bounds': [[south, west], [north, east]],
+            'lats': lats,
+            'lngs': lngs,
+            'elevations': elevations,
+            'labels': labels,
+            'statistics': zone_stats
+        }
+        
     except Exception as e:
         print(f"Error dividing elevation zones: {str(e)}")
         return None
\ No newline at end of file
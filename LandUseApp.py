@@ -1,16 +1,29 @@
+import time
+STARTUP_TIME = time.perf_counter()
+
+import sys
 import tkinter as tk
 from tkinter import ttk
 import os
-from Elevation import divide_elevation_zones, generate_elevation_map , get_elevation, classify_elevation
-from rule_based import classify_land_use, get_marker_color
-from model import initialize_model, predict_land_use
+from Elevation import DEMSampler, divide_elevation_zones, generate_elevation_map , get_elevation, get_elevations, classify_elevation
+from rule_based import classify_land_use, classify_land_use_batch, get_marker_color
+from model import initialize_model, predict_land_use, predict_land_use_batch, training_in_progress, fine_tune_model, show_inference_benchmark
 from osm_places import query_osm_places
-from tabs import setup_main_tab, setup_analysis_tab, setup_visualization_tab, setup_export_tab
+from tabs import setup_main_tab, setup_analysis_tab, setup_visualization_tab, setup_export_tab, setup_chart_canvas
 from save_and_export import export_model_report, export_analysis_report, export_all_maps, export_data, save_results
 from maps import generate_all_maps, generate_standard_map, generate_cluster_map, generate_choropleth_map, generate_heat_map, generate_selected_map
 from filters import apply_visualization_filters, reset_visualization_filters, update_land_use_filter_values
-from data import load_data, get_local_places, get_combined_places
+from cache import LRUCache
+from model_store import rules_fingerprint
+from place_store import PlaceStore
+from data import load_data, get_local_places, get_combined_places, add_elevations
 from table_and_update import update_table, on_search, on_search_table, update_statistics, update_chart, edit_place
+from tflite_backend import show_tflite_parity
+from tfidf_classifier import CLASSIFIER_BACKENDS, initialize_tfidf_classifier, apply_tfidf_classifier
+from lazy_imports import record_phase, startup_report
+
+# Heavy libraries (TensorFlow, sklearn, pandas, matplotlib, folium, rasterio) are imported on first use
+IMPORTS_DONE_TIME = time.perf_counter()
 
 class LandUseApp:
     def __init__(self, root):
@@ -19,7 +32,7 @@ class LandUseApp:
         #self.root.state('zoomed')
         
         # Initialize variables
-        self.filtered_places = []
+        self.filtered_places = PlaceStore()  # columnar results of the last search
         self.user_lat = None
         self.user_lng = None
         self.current_radius = None
@@ -27,7 +40,34 @@ class LandUseApp:
         self.analysis_folder = "analysis_results"
         self.data = []
         self.df = None
+        self.place_index = None  # haversine BallTree over self.data, built in load_data
+        self.place_index_rows = None
         self.model = None
+        self.tokenizer = None
+        self.model_version = None
+        self.model_artifact_dir = "model_artifacts"
+        # Tagged with the rule table version, so saved rule-based results are dropped when the rules change
+        self.prediction_cache = LRUCache(
+            maxsize=100000,
+            path=os.path.join(self.model_artifact_dir, "prediction_lru.json"),
+            tag=rules_fingerprint()
+        )
+        self.prediction_batch_size = 256
+        self.inference_backend = 'keras'  # or 'tflite-float16' / 'tflite-int8'
+        self.tflite_classifiers = {}
+        self.interactive_predict = None  # compiled single-item path, see model.build_interactive_predictor
+        self.classifier_backend = 'cascade'  # see tfidf_classifier.CLASSIFIER_BACKENDS
+        self.cascade_tiers = CLASSIFIER_BACKENDS[self.classifier_backend]
+        self.linear_classifier = None  # callable(names, place_types) -> (labels, confidences)
+        self.tfidf_metrics = None
+        self.linear_confidence_threshold = 0.8
+        self.model_artifact_path = None
+        self.training_thread = None  # background training worker, see model.initialize_model
+        self.training_queue = None
+        self.training_active = False  # see model.training_in_progress
+        self.corrections_file = os.path.join(self.model_artifact_dir, "corrections.jsonl")  # edit dialog corrections
+        self.fine_tune_pending = False
+        self.tfidf_pending = False  # TF-IDF training waiting for the worker, see tfidf_classifier
         self.tfidf = None
         self.label_encoder = None
         self.X_test = None
@@ -37,9 +77,24 @@ class LandUseApp:
         for folder in [self.maps_folder, self.analysis_folder]:
             os.makedirs(folder, exist_ok=True)
         
-        self.setup_gui()
-        self.load_data()
+        # DEM handle is opened once and shared by every elevation lookup
         self.dem_file = "SLMerge.tif"
+        self.dem_cache_dir = "dem_cache"  # built with: python dem_cache.py SLMerge.tif
+        self.dem_workers = min(8, os.cpu_count() or 1)  # threads for large batch elevation reads
+        self.elevation_cache_size = 200000  # DEM pixels kept in the elevation LRU (see dem_sampler.elevation_cache.stats())
+        self.dem_sampler = DEMSampler(self.dem_file, self.dem_cache_dir, max_workers=self.dem_workers,
+                                      elevation_cache_size=self.elevation_cache_size)
+        self.dem_pixel_budget = 40000  # minimum DEM samples inside the search circle
+        self.elevation_map_mode = 'overlay'  # 'overlay' image or per-pixel 'markers'
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        self.setup_gui()
+        record_phase("application imports", IMPORTS_DONE_TIME - STARTUP_TIME)
+        record_phase("window setup", time.perf_counter() - IMPORTS_DONE_TIME)
+        
+        # Data and model load after the window is shown
+        self.set_status("Loading data and model...")
+        self.root.after(100, self.warm_up)
         
         # Add elevation colors for visualization
         self.elevation_colors = {
@@ -51,13 +106,17 @@ class LandUseApp:
         }
 
     def divide_elevation_zones(self):
-        return  divide_elevation_zones(self.dem_file, self.user_lat, self.user_lng, self.current_radius)
+        return  divide_elevation_zones(self.dem_sampler, self.user_lat, self.user_lng, self.current_radius,
+                                       self.dem_pixel_budget)
         
     def generate_elevation_map(self):
         return generate_elevation_map(self)
 
     def get_elevation(self,lat,lng):
-        return get_elevation(self.dem_file, lat, lng)
+        return get_elevation(self.dem_sampler, lat, lng)
+
+    def get_elevations(self, lats, lngs):
+        return get_elevations(self.dem_sampler, lats, lngs)
     
     def classify_elevation(self, elevation):
         return classify_elevation(elevation)       
@@ -65,9 +124,43 @@ class LandUseApp:
     @staticmethod
     def classify_land_use(name, place_type):
      return classify_land_use(name, place_type)
+
+    @staticmethod
+    def classify_land_use_batch(names, place_types):
+        return classify_land_use_batch(names, place_types)
         
-    def initialize_model(self):
-      return initialize_model(self)
+    def initialize_model(self, force_retrain=False):
+      return initialize_model(self, force_retrain)
+
+    def fine_tune_model(self):
+        return fine_tune_model(self)
+
+    def set_inference_backend(self, backend):
+        self.inference_backend = backend
+        self.set_status(f"Inference backend: {backend}")
+
+    def show_tflite_parity(self):
+        return show_tflite_parity(self)
+
+    def show_inference_benchmark(self):
+        return show_inference_benchmark(self)
+
+    def initialize_tfidf_classifier(self, force_retrain=False):
+        return initialize_tfidf_classifier(self, force_retrain)
+
+    def apply_tfidf_classifier(self, bundle):
+        return apply_tfidf_classifier(self, bundle)
+
+    def set_classifier_backend(self, backend):
+        self.classifier_backend = backend
+        self.cascade_tiers = CLASSIFIER_BACKENDS[backend]
+        self.set_status(f"Classifier backend: {backend}")
+
+    def retrain_model(self):
+        """Retrain from scratch even when saved artifacts match the data"""
+        # The model claims the training worker first; the TF-IDF fit is queued behind it
+        self.initialize_model(force_retrain=True)
+        self.initialize_tfidf_classifier(force_retrain=True)
 
     def query_osm_places(self):
         return query_osm_places(self)
@@ -100,6 +193,9 @@ class LandUseApp:
     def predict_land_use(self, name, place_type):
         return predict_land_use(self, name, place_type)
 
+    def predict_land_use_batch(self, names, place_types, batch_size=None, tier_counts=None):
+        return predict_land_use_batch(self, names, place_types, batch_size, tier_counts)
+
 
     def on_search(self):
         return on_search(self)
@@ -110,6 +206,9 @@ class LandUseApp:
     def get_local_places(self):
         return get_local_places(self)
 
+    def add_elevations(self, places):
+        return add_elevations(self, places)
+
     
     def generate_all_maps(self):
         return generate_all_maps(self)
@@ -163,7 +262,42 @@ class LandUseApp:
     def on_search_table(self, *args):
         return on_search_table(self, *args)
     
+    def warm_up(self):
+        """Load the heavy subsystems once the window is on screen"""
+        start = time.perf_counter()
+        self.load_data()
+        record_phase("data and model loading", time.perf_counter() - start)
+        if not training_in_progress(self):
+            self.set_status("Ready")
+        
+        if "--startup-report" in sys.argv:
+            print(startup_report())
+
+    def set_status(self, text):
+        self.status_var.set(text)
+        self.root.update_idletasks()
+
+    def show_startup_report(self):
+        report_window = tk.Toplevel(self.root)
+        report_window.title("Startup Report")
+        report_text = tk.Text(report_window, height=25, width=80, font=("Courier", 9))
+        report_text.insert(tk.END, startup_report())
+        report_text.configure(state="disabled")
+        report_text.pack(fill="both", expand=True, padx=10, pady=10)
+
+    def on_close(self):
+        self.prediction_cache.save()
+        self.dem_sampler.close()
+        self.root.destroy()
+    
+    def setup_chart_canvas(self):
+        return setup_chart_canvas(self)
+
     def setup_gui(self):
+        # Status bar for background loading progress
+        self.status_var = tk.StringVar(value="Starting...")
+        ttk.Label(self.root, textvariable=self.status_var, anchor="w", relief="sunken").pack(side="bottom", fill="x")
+        
         # Create main container with tabs
         self.tab_control = ttk.Notebook(self.root)
         
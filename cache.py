@@ -0,0 +1,93 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+
+
+def _to_tuple(value):
+        """JSON turns tuples into lists; turn them back so keys stay hashable"""
+        if isinstance(value, list):
+            return tuple(_to_tuple(item) for item in value)
+        return value
+
+
+class LRUCache:
+    """Bounded least-recently-used cache with hit/miss counters and optional JSON persistence.
+    Keys and values must be JSON-serializable scalars or (nested) tuples of them."""
+
+    def __init__(self, maxsize=100000, path=None, tag=None):
+        self.maxsize = maxsize
+        self.path = path
+        self.tag = tag  # entries saved under a different tag are discarded on load
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        if path:
+            self.load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._entries.get(key, None)
+            if value is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Hit/miss counters and fill level, for sizing the cache"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self._entries),
+            'maxsize': self.maxsize
+        }
+
+    def load(self):
+        """Load entries saved by a previous session, if any"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                saved = json.load(f)
+            if saved.get('tag') != self.tag:
+                return
+            with self._lock:
+                for key, value in saved.get('entries', [])[-self.maxsize:]:
+                    self._entries[_to_tuple(key)] = _to_tuple(value)
+        except Exception as e:
+            print(f"Error loading cache {self.path}: {str(e)}")
+
+    def save(self):
+        """Write the entries to disk, least recently used first"""
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with self._lock:
+                entries = [[key, value] for key, value in self._entries.items()]
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump({'tag': self.tag, 'entries': entries}, f)
+        except Exception as e:
+            print(f"Error saving cache {self.path}: {str(e)}")
@@ -0,0 +1,42 @@
+import os
+import json
+import datetime
+
+
+def correction_key(name, place_type):
+        return (str(name).strip().lower(), str(place_type).strip().lower())
+
+
+def log_correction(path, name, place_type, land_use):
+        """Append one user correction to the JSON-lines correction store"""
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({
+                    'name': name,
+                    'place_type': place_type,
+                    'land_use': land_use,
+                    'corrected_at': datetime.datetime.now().isoformat()
+                }) + "\n")
+        except Exception as e:
+            print(f"Error saving correction to {path}: {str(e)}")
+
+
+def load_corrections(path):
+        """Logged corrections, oldest first; a later correction of the same place replaces an earlier one"""
+        if not path or not os.path.exists(path):
+            return []
+
+        corrections = {}
+        try:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    correction = json.loads(line)
+                    key = correction_key(correction['name'], correction['place_type'])
+                    corrections.pop(key, None)
+                    corrections[key] = correction
+        except Exception as e:
+            print(f"Error loading corrections from {path}: {str(e)}")
+        return list(corrections.values())
@@ -1,69 +1,116 @@
 import os
 import json
-import pandas as pd
+import numpy as np
 from tkinter import messagebox
-from geopy.distance import geodesic
+from lazy_imports import lazy_import
+from geo import EARTH_RADIUS_KM, distances_km
+from place_store import PlaceStore
+
+INDEX_RADIUS_MARGIN = 1.01  # widens index queries to cover haversine vs. geodesic differences (< 0.6%)
 
 def get_combined_places(self):
-        # Combine local and OSM data with elevation info
+        # Combine local and OSM data; both paths already carry elevation info
         local_places = self.get_local_places()
         osm_places = self.query_osm_places()
         
-        # Add elevation data to OSM places
-        for place in osm_places:
-            elevation, elevation_class = self.get_elevation(place['lat'], place['lng'])
-            place['elevation'] = elevation if elevation is not None else 0
-            place['elevation_class'] = elevation_class if elevation_class is not None else 'Unknown'
+        return PlaceStore.concat([local_places, osm_places])
+
+def add_elevations(self, places):
+        """Fill the elevation columns of a PlaceStore with one batched DEM lookup"""
+        if not places:
+            return places
+        
+        elevations, elevation_classes = self.get_elevations(places.column('lat'), places.column('lng'))
+        places.set_column('elevation', np.asarray(elevations, dtype=np.float64))
+        places.set_column('elevation_class', list(elevation_classes))
+        return places
+
+def build_place_index(places):
+        """
+        Haversine BallTree over the coordinates of the local places.
+        Returns (tree, rows) where rows maps tree positions back to indices into places.
+        """
+        BallTree = lazy_import("sklearn.neighbors").BallTree
+        rows = []
+        coordinates = []
+        for index, place in enumerate(places):
+            try:
+                coordinates.append((float(place['location']['lat']), float(place['location']['lng'])))
+                rows.append(index)
+            except (KeyError, TypeError, ValueError):
+                continue
         
-        return local_places + osm_places
+        if not coordinates:
+            return None, np.empty(0, dtype=np.int64)
+        return BallTree(np.radians(coordinates), metric='haversine'), np.array(rows, dtype=np.int64)
+
+def candidate_places(self):
+        """Local places that may lie within the search radius; every place when there is no index"""
+        if self.place_index is None:
+            return self.data
+        
+        radius = self.current_radius / 1000 * INDEX_RADIUS_MARGIN / EARTH_RADIUS_KM
+        tree_rows = self.place_index.query_radius(np.radians([[self.user_lat, self.user_lng]]), r=radius)[0]
+        # Keep dataset order so place ids stay stable between the indexed and full scans
+        return [self.data[index] for index in np.sort(self.place_index_rows[tree_rows])]
 
 def get_local_places(self):
-        places = []
         self.google_prediction_sources = {'model': 0, 'rule-based': 0}
+        self.google_tier_counts = {}
         
-        for place in self.data:
+        candidates = []
+        for place in candidate_places(self):
             try:
-                distance = geodesic(
-                    (self.user_lat, self.user_lng),
-                    (place['location']['lat'], place['location']['lng'])
-                ).km
-                
-                if distance <= self.current_radius / 1000:
-                    predicted_land_use, source = self.predict_land_use(
-                        place.get('name', ''),
-                        place.get('place_type', '')
-                    )
-                    self.google_prediction_sources[source] += 1
-                    
-                    # Get elevation data with error handling
-                    elevation, elevation_class = self.get_elevation(
-                        place['location']['lat'],
-                        place['location']['lng']
-                    )
-                    
-                    places.append({
-                        'id': len(places) + 1,
-                        'name': place.get('name', 'Unnamed'),
-                        'lat': place['location']['lat'],
-                        'lng': place['location']['lng'],
-                        'place_type': place.get('place_type', ''),
-                        'land_use': predicted_land_use,
-                        'prediction_source': source,
-                        'distance': round(distance, 2),
-                        'elevation': elevation if elevation is not None else 0,
-                        'elevation_class': elevation_class if elevation_class is not None else 'Unknown'
-                    })
+                candidates.append((place, float(place['location']['lat']), float(place['location']['lng'])))
             except Exception as e:
                 print(f"Error processing place: {str(e)}")
-                continue
+        
+        # Distances to all candidates in one array operation; geodesic only near the radius
+        radius_km = self.current_radius / 1000
+        distances = distances_km(
+            self.user_lat, self.user_lng,
+            [lat for _, lat, _ in candidates],
+            [lng for _, _, lng in candidates],
+            radius_km=radius_km
+        )
+        inside = np.flatnonzero(distances <= radius_km)
+        matched = [candidates[index] for index in inside]
+        
+        # Classify all matched places with one batched prediction
+        place_types = [place.get('place_type', '') for place, _, _ in matched]
+        predictions, sources = self.predict_land_use_batch(
+            [place.get('name', '') for place, _, _ in matched],
+            place_types,
+            tier_counts=self.google_tier_counts
+        )
+        for source in sources:
+            self.google_prediction_sources[source] += 1
+        
+        places = PlaceStore.from_columns(
+            id=np.arange(1, len(matched) + 1),
+            name=[place.get('name', 'Unnamed') for place, _, _ in matched],
+            lat=[lat for _, lat, _ in matched],
+            lng=[lng for _, _, lng in matched],
+            place_type=place_types,
+            land_use=predictions,
+            prediction_source=sources,
+            distance=np.round(distances[inside], 2),
+            elevation=0.0,
+            elevation_class='Unknown'
+        )
+        
+        # Get elevation data for all matched places in one pass
+        self.add_elevations(places)
         
         self.google_total = sum(self.google_prediction_sources.values())
         return places
 
 def load_data(self):
+        pd = lazy_import("pandas")
         try:
             script_dir = os.path.dirname(os.path.abspath(__file__))
             json_file_path = os.path.join(script_dir, 'sri_lanka_places.json')
+            self.data_file = json_file_path
             
             # Check if file exists
             if not os.path.exists(json_file_path):
@@ -96,12 +143,17 @@ def load_data(self):
                 })
             
             self.df = pd.DataFrame(places_list)
+            
+            # Spatial index for radius searches in get_local_places
+            self.place_index, self.place_index_rows = build_place_index(self.data)
             #self.classify_land_use(name='name',place_type='place_type')
             # Initialize the model
             self.initialize_model()
+            self.initialize_tfidf_classifier()
             
         except Exception as e:
             messagebox.showwarning("Warning", f"Data loading issue: {str(e)}\nUsing empty dataset.")
             self.data = []
             self.df = pd.DataFrame(columns=['name', 'place_type', 'lat', 'lng', 'land_use'])
+            self.place_index, self.place_index_rows = None, None
 
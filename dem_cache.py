@@ -0,0 +1,239 @@
+import os
+import json
+import argparse
+import threading
+from collections import OrderedDict
+import numpy as np
+from lazy_imports import lazy_import
+
+DEFAULT_CACHE_DIR = "dem_cache"
+DEFAULT_TILE_SIZE = 256
+DEFAULT_PYRAMID_LEVELS = 4
+CACHE_FORMAT = 2  # bump when the tile layout or overview resampling changes
+
+
+def cache_paths(cache_dir, level=0):
+        """Paths of the tile array and its sidecar index for one pyramid level"""
+        suffix = f"_L{level}" if level else ""
+        return (os.path.join(cache_dir, f"dem_tiles{suffix}.npy"),
+                os.path.join(cache_dir, f"dem_tiles{suffix}.json"))
+
+
+def write_tiles(tiles_path, read_strip, height, width, dtype, fill_value, tile_size):
+        """Write a (height, width) raster into a memory-mapped tile array.
+        read_strip(row_off, strip_height) must return the full-width rows of that strip."""
+        tile_rows = -(-height // tile_size)
+        tile_cols = -(-width // tile_size)
+
+        tiles = np.lib.format.open_memmap(
+            tiles_path,
+            mode='w+',
+            dtype=dtype,
+            shape=(tile_rows, tile_cols, tile_size, tile_size)
+        )
+
+        # Decode the source one strip of tiles at a time
+        for tile_row in range(tile_rows):
+            row_off = tile_row * tile_size
+            strip_height = min(tile_size, height - row_off)
+            strip = read_strip(row_off, strip_height)
+
+            for tile_col in range(tile_cols):
+                col_off = tile_col * tile_size
+                tile_width = min(tile_size, width - col_off)
+                tile = tiles[tile_row, tile_col]
+                tile[...] = fill_value
+                tile[:strip_height, :tile_width] = strip[:, col_off:col_off + tile_width]
+
+        tiles.flush()
+        del tiles
+        return tile_rows, tile_cols
+
+
+def downsample_strip(strip, nodata, fill_value):
+        """
+        Average each 2x2 block of a strip, ignoring nodata, so an overview pixel
+        represents the block centred on it; blocks with no valid pixel get fill_value
+        """
+        height, width = strip.shape
+        padded = np.full((height + height % 2, width + width % 2), np.nan)
+        padded[:height, :width] = strip
+        if nodata is not None and not np.isnan(nodata):
+            padded[padded == nodata] = np.nan
+
+        blocks = padded.reshape(padded.shape[0] // 2, 2, padded.shape[1] // 2, 2)
+        valid = np.isfinite(blocks)
+        counts = valid.sum(axis=(1, 3))
+        sums = np.where(valid, blocks, 0).sum(axis=(1, 3))
+
+        averaged = np.full(counts.shape, fill_value, dtype=np.float64)
+        np.divide(sums, counts, out=averaged, where=counts > 0)
+        if np.issubdtype(strip.dtype, np.integer):
+            averaged = np.rint(averaged)
+        return averaged.astype(strip.dtype)
+
+
+def build_dem_cache(dem_file, cache_dir=DEFAULT_CACHE_DIR, tile_size=DEFAULT_TILE_SIZE, pyramid_levels=0):
+        """
+        Convert a DEM GeoTIFF into fixed-size tiles stored in a memory-mapped .npy
+        array of shape (tile_rows, tile_cols, tile_size, tile_size), with a JSON
+        sidecar index holding the grid metadata. With pyramid_levels > 0, overview
+        levels of 2x, 4x, 8x... are built from the previous level by 2x2 averaging.
+        Returns the index dictionary of the full-resolution level.
+        """
+        rasterio = lazy_import("rasterio")
+        Window = lazy_import("rasterio.windows").Window
+        Affine = lazy_import("rasterio.transform").Affine
+        os.makedirs(cache_dir, exist_ok=True)
+
+        with rasterio.open(dem_file) as src:
+            source_stat = os.stat(dem_file)
+            base_index = {
+                'source': os.path.abspath(dem_file),
+                'source_size': source_stat.st_size,
+                'source_mtime': source_stat.st_mtime,
+                'format': CACHE_FORMAT,
+                'tile_size': tile_size,
+                'level': 0,
+                'height': src.height,
+                'width': src.width,
+                'dtype': src.dtypes[0],
+                'nodata': src.nodata,
+                'transform': list(src.transform)[:6],
+                'crs': src.crs.to_string() if src.crs else None
+            }
+            fill_value = src.nodata if src.nodata is not None else 0
+
+            def read_source_strip(row_off, strip_height):
+                return src.read(1, window=Window(0, row_off, src.width, strip_height))
+
+            tiles_path, index_path = cache_paths(cache_dir)
+            base_index['tile_rows'], base_index['tile_cols'] = write_tiles(
+                tiles_path, read_source_strip, src.height, src.width,
+                src.dtypes[0], fill_value, tile_size
+            )
+
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump(base_index, f, indent=4)
+
+        # Each overview pixel averages the 2x2 block below it, so its value sits at the
+        # centre that the scaled transform assigns to it
+        for level in range(1, pyramid_levels + 1):
+            previous = TiledDEM(cache_dir, level=level - 1)
+            index = dict(base_index)
+            index['level'] = level
+            index['height'] = -(-previous.height // 2)
+            index['width'] = -(-previous.width // 2)
+            index['transform'] = list(previous.transform * Affine.scale(2))[:6]
+
+            def read_downsampled_strip(row_off, strip_height, previous=previous):
+                source_rows = min(strip_height * 2, previous.height - row_off * 2)
+                strip = previous.read(Window(0, row_off * 2, previous.width, source_rows))
+                return downsample_strip(strip, previous.nodata, fill_value)
+
+            tiles_path, index_path = cache_paths(cache_dir, level)
+            index['tile_rows'], index['tile_cols'] = write_tiles(
+                tiles_path, read_downsampled_strip, index['height'], index['width'],
+                index['dtype'], fill_value, tile_size
+            )
+            with open(index_path, 'w', encoding='utf-8') as f:
+                json.dump(index, f, indent=4)
+
+        return base_index
+
+
+class TiledDEM:
+    """Serves window reads from the tile cache through np.memmap, keeping hot tiles in an LRU"""
+
+    def __init__(self, cache_dir, max_tiles=64, level=0):
+        tiles_path, index_path = cache_paths(cache_dir, level)
+        with open(index_path, encoding='utf-8') as f:
+            self.index = json.load(f)
+
+        # Tiles are paged in lazily by the OS as they are touched
+        self.tiles = np.load(tiles_path, mmap_mode='r')
+        self.level = level
+        self.tile_size = self.index['tile_size']
+        self.height = self.index['height']
+        self.width = self.index['width']
+        self.nodata = self.index['nodata']
+        self.transform = lazy_import("rasterio.transform").Affine(*self.index['transform'])
+        self.res = (abs(self.transform.a), abs(self.transform.e))
+        self.block_shapes = [(self.tile_size, self.tile_size)]
+
+        self.max_tiles = max_tiles
+        self._hot_tiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open_if_fresh(cls, dem_file, cache_dir, max_tiles=64, level=0):
+        """Open one cache level unless it is missing or older than the source DEM"""
+        tiles_path, index_path = cache_paths(cache_dir, level)
+        if not (os.path.exists(tiles_path) and os.path.exists(index_path)):
+            return None
+
+        try:
+            cache = cls(cache_dir, max_tiles, level)
+            if cache.index.get('format') != CACHE_FORMAT:
+                print(f"DEM cache in {cache_dir} uses an old format; rebuild it with dem_cache.py")
+                return None
+            if os.path.exists(dem_file):
+                source_stat = os.stat(dem_file)
+                if (cache.index['source_size'] != source_stat.st_size or
+                        cache.index['source_mtime'] != source_stat.st_mtime):
+                    print(f"DEM cache in {cache_dir} is stale; rebuild it with dem_cache.py")
+                    return None
+            return cache
+        except Exception as e:
+            print(f"Error opening DEM cache {cache_dir}: {str(e)}")
+            return None
+
+    def tile(self, tile_row, tile_col):
+        """Return one tile as an in-memory array, serving repeats from the LRU"""
+        key = (tile_row, tile_col)
+        with self._lock:
+            tile = self._hot_tiles.get(key)
+            if tile is not None:
+                self._hot_tiles.move_to_end(key)
+                return tile
+
+        tile = np.array(self.tiles[tile_row, tile_col])
+        with self._lock:
+            self._hot_tiles[key] = tile
+            if len(self._hot_tiles) > self.max_tiles:
+                self._hot_tiles.popitem(last=False)
+        return tile
+
+    def read(self, window):
+        """Assemble an in-bounds window from the tiles it overlaps"""
+        row_off, col_off = int(window.row_off), int(window.col_off)
+        height, width = int(window.height), int(window.width)
+        size = self.tile_size
+        data = np.empty((height, width), dtype=self.tiles.dtype)
+
+        for tile_row in range(row_off // size, (row_off + height - 1) // size + 1):
+            for tile_col in range(col_off // size, (col_off + width - 1) // size + 1):
+                tile = self.tile(tile_row, tile_col)
+                row_start = max(row_off, tile_row * size)
+                row_stop = min(row_off + height, (tile_row + 1) * size)
+                col_start = max(col_off, tile_col * size)
+                col_stop = min(col_off + width, (tile_col + 1) * size)
+                data[row_start - row_off:row_stop - row_off, col_start - col_off:col_stop - col_off] = \
+                    tile[row_start - tile_row * size:row_stop - tile_row * size,
+                         col_start - tile_col * size:col_stop - tile_col * size]
+        return data
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-tile a DEM GeoTIFF into a memory-mapped cache")
+    parser.add_argument("dem_file", nargs="?", default="SLMerge.tif")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--tile-size", type=int, default=DEFAULT_TILE_SIZE)
+    parser.add_argument("--pyramid-levels", type=int, default=DEFAULT_PYRAMID_LEVELS,
+                        help="number of 2x overview levels to build (0 disables the pyramid)")
+    args = parser.parse_args()
+
+    index = build_dem_cache(args.dem_file, args.cache_dir, args.tile_size, args.pyramid_levels)
+    print(f"Cached {index['height']}x{index['width']} DEM as "
+          f"{index['tile_rows']}x{index['tile_cols']} tiles of {index['tile_size']}px "
+          f"with {args.pyramid_levels} overview levels in {args.cache_dir}")
@@ -3,12 +3,13 @@ import webbrowser
 import datetime
 from tkinter import messagebox
 import tkinter as tk
+import numpy as np
 
 
 def update_land_use_filter_values(self):
         """Update the land use filter dropdown with available values"""
         if self.filtered_places:
-            unique_land_uses = sorted(set(place['land_use'] for place in self.filtered_places))
+            unique_land_uses = sorted(self.filtered_places.frame['land_use'].unique())
             self.land_use_filter['values'] = ['All'] + list(unique_land_uses)
             self.land_use_filter.set('All')
 
@@ -25,29 +26,26 @@ def apply_visualization_filters(self):
             selected_land_use = self.land_use_filter.get()
             max_distance_str = self.distance_filter.get().strip()
             
-            # Store original data
-            original_places = self.filtered_places.copy()
-            filtered_data = original_places.copy()
+            mask = np.ones(len(self.filtered_places), dtype=bool)
             
             # Apply land use filter
             if selected_land_use and selected_land_use != "All":
-                filtered_data = [p for p in filtered_data 
-                            if p['land_use'] == selected_land_use]
+                mask &= self.filtered_places.column('land_use') == selected_land_use
             
             # Apply distance filter
             if max_distance_str:
                 try:
                     max_dist = float(max_distance_str)
-                    filtered_data = [p for p in filtered_data 
-                                if p['distance'] <= max_dist]
+                    mask &= self.filtered_places.column('distance') <= max_dist
                 except ValueError:
                     messagebox.showwarning("Warning", 
                                         "Invalid distance value. Please enter a number.")
                     return
             
-            if not filtered_data:
+            if not mask.any():
                 messagebox.showinfo("Info", "No places match the selected filters")
                 return
+            filtered_data = self.filtered_places.filter(mask)
             
             # Update visualization with filtered data
             self.filtered_places = filtered_data
@@ -0,0 +1,39 @@
+import sys
+import time
+import importlib
+
+# Seconds spent importing each heavy module on first use, and in each startup phase
+import_times = {}
+startup_phases = []
+
+
+def lazy_import(module_name):
+        """Import a module on first use and record how long the import took"""
+        module = sys.modules.get(module_name)
+        if module is not None:
+            return module
+
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        import_times[module_name] = time.perf_counter() - start
+        return module
+
+
+def record_phase(name, seconds):
+        """Record the duration of a named startup phase"""
+        startup_phases.append((name, seconds))
+
+
+def startup_report():
+        """Text report in the spirit of python -X importtime: phases first, then deferred imports"""
+        lines = ["Startup phases:"]
+        for name, seconds in startup_phases:
+            lines.append(f"{seconds * 1e6:>12.0f} us | {name}")
+
+        lines.append("")
+        lines.append("Deferred imports (first use, slowest first):")
+        for module_name, seconds in sorted(import_times.items(), key=lambda item: item[1], reverse=True):
+            lines.append(f"{seconds * 1e6:>12.0f} us | {module_name}")
+        if not import_times:
+            lines.append("             (none yet)")
+        return "\n".join(lines)
@@ -1,11 +1,9 @@
-import folium
 import os
 import webbrowser
 import datetime
 from tkinter import messagebox
-from folium.plugins import HeatMap, MarkerCluster
-import matplotlib.pyplot as plt
 import numpy as np
+from lazy_imports import lazy_import
 
 def generate_selected_map(self, event=None, filtered_data=None):
         if filtered_data is None:
@@ -47,13 +45,15 @@ def generate_selected_map(self, event=None, filtered_data=None):
 
 
 def generate_heat_map(self):
+        folium = lazy_import("folium")
+        HeatMap = lazy_import("folium.plugins").HeatMap
         map_obj = folium.Map(
             location=[self.user_lat, self.user_lng],
             zoom_start=13
         )
         
         # Add heat map layer
-        heat_data = [[p['lat'], p['lng']] for p in self.filtered_places]
+        heat_data = np.column_stack([self.filtered_places.column('lat'), self.filtered_places.column('lng')]).tolist()
         HeatMap(
             heat_data,
             radius=15,
@@ -65,6 +65,8 @@ def generate_heat_map(self):
 
 def generate_choropleth_map(self):
         """Generate a proper choropleth map showing land use density"""
+        folium = lazy_import("folium")
+        plt = lazy_import("matplotlib.pyplot")
         map_obj = folium.Map(
             location=[self.user_lat, self.user_lng],
             zoom_start=13
@@ -74,7 +76,7 @@ def generate_choropleth_map(self):
         land_use_groups = {}
         
         # Get unique land uses and assign colors
-        unique_land_uses = set(place['land_use'] for place in self.filtered_places)
+        unique_land_uses = set(self.filtered_places.column('land_use'))
         color_scale = plt.cm.Set3(np.linspace(0, 1, len(unique_land_uses)))
         color_map = dict(zip(unique_land_uses, 
                             [f'#{"%02x%02x%02x" % tuple(map(lambda x: int(x * 255), color[:3]))}' 
@@ -132,6 +134,8 @@ def generate_choropleth_map(self):
         return map_obj
 
 def generate_cluster_map(self):
+        folium = lazy_import("folium")
+        MarkerCluster = lazy_import("folium.plugins").MarkerCluster
         map_obj = folium.Map(
             location=[self.user_lat, self.user_lng],
             zoom_start=13
@@ -161,6 +165,7 @@ def generate_cluster_map(self):
         return map_obj
 
 def generate_standard_map(self):
+        folium = lazy_import("folium")
         map_obj = folium.Map(
             location=[self.user_lat, self.user_lng],
             zoom_start=13
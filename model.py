@@ -1,95 +1,420 @@
-from tensorflow import keras
 import numpy as np 
-from sklearn.model_selection import train_test_split
-from keras import layers
+from tkinter import messagebox
+import time
+import queue
+import datetime
+import threading
+from types import SimpleNamespace
+from lazy_imports import lazy_import
+from model_store import data_fingerprint, artifact_path, save_model_artifacts, load_model_artifacts
+from tflite_backend import export_tflite_models, get_tflite_classifier
+from corrections import load_corrections
+from rule_based import exact_land_use, classify_land_use_series
+
+MAX_SEQUENCE_LENGTH = 20  # Should match the max_sequence_length used in training
+CONFIDENCE_THRESHOLD = 0.5  # Below this the rule-based classifier is used instead
+INTERACTIVE_BATCH_LIMIT = 32  # Batches up to this size use the compiled tf.function path
+# Tiers of the classification cascade, in the order they are tried ('cache' hits skip all of them)
+CASCADE_TIERS = ('cache', 'rule-exact', 'linear', 'lstm', 'rule-fallback', 'error-fallback')
+UNCACHED_TIERS = ('error-fallback',)  # stand-in results after a model failure are never memoized
+TRAINING_POLL_MS = 200  # How often the Tk thread checks the training queue
+FINE_TUNE_EPOCHS = 3
+FINE_TUNE_LEARNING_RATE = 1e-4
+REPLAY_SAMPLE_SIZE = 512  # original examples mixed into each fine-tuning run
+CORRECTION_WEIGHT = 5.0  # sample weight of a user correction relative to a replayed example
+
+# Everything a training run produces; swapped into the app together
+TRAINED_ATTRIBUTES = ('model', 'tokenizer', 'label_mapping', 'reverse_mapping', 'X_test', 'y_test',
+                      'y_pred_classes', 'history', 'test_loss', 'test_accuracy', 'model_summary',
+                      'model_version', 'model_artifact_path', 'training_seconds', 'interactive_predict')
+
 
 def predict_land_use(self, name, place_type):
         """Predict land use using the trained RNN model"""
+        predictions, sources = predict_land_use_batch(self, [name], [place_type])
+        return predictions[0], sources[0]
+
+
+def prediction_cache_key(name, place_type, model_version):
+        """Normalized cache key; the version id invalidates entries when the model is retrained"""
+        return (str(name).strip().lower(), str(place_type).strip().lower(), model_version or 'rules')
+
+
+def predict_land_use_batch(self, names, place_types, batch_size=None, tier_counts=None):
+        """
+        Predict land use for whole lists of places through the classification cascade.
+        Returns (predictions, sources) lists aligned with the inputs. Results are memoized
+        in self.prediction_cache, so only unseen (name, place_type) pairs are classified.
+        If tier_counts is given, it is incremented with the tier that resolved each place.
+        """
+        count = len(names)
+        predictions = [None] * count
+        sources = [None] * count
+        tiers = ['cache'] * count
+        # Predictions depend on the trained weights, the inference backend and the cascade
+        cascade = '+'.join(self.cascade_tiers)
+        if 'linear' in self.cascade_tiers and self.linear_classifier is not None:
+            cascade += f"@{self.linear_classifier.version}"
+        model_version = (f"{self.model_version}/{active_inference_backend(self)}/{cascade}"
+                         if self.model is not None else f"rules/{cascade}")
+        
+        keys = [prediction_cache_key(name, place_type, model_version)
+                for name, place_type in zip(names, place_types)]
+        missing = []
+        for index, key in enumerate(keys):
+            cached = self.prediction_cache.get(key)
+            if cached is None:
+                missing.append(index)
+            else:
+                predictions[index], sources[index] = cached
+        
+        if missing:
+            new_predictions, new_sources, new_tiers = predict_uncached(
+                self,
+                [names[index] for index in missing],
+                [place_types[index] for index in missing],
+                batch_size
+            )
+            for index, prediction, source, tier in zip(missing, new_predictions, new_sources, new_tiers):
+                predictions[index] = prediction
+                sources[index] = source
+                tiers[index] = tier
+                if tier not in UNCACHED_TIERS:
+                    self.prediction_cache.put(keys[index], (prediction, source))
+        
+        if tier_counts is not None:
+            for tier in tiers:
+                tier_counts[tier] = tier_counts.get(tier, 0) + 1
+        
+        return predictions, sources
+
+
+def predict_uncached(self, names, place_types, batch_size=None):
+        """
+        Classification cascade: exact rule-table hits on place_type, then the optional
+        linear classifier, then one batched LSTM call for whatever is still ambiguous.
+        Returns (predictions, sources, tiers) lists aligned with the inputs.
+        """
+        count = len(names)
+        predictions = [None] * count
+        sources = [None] * count
+        tiers = [None] * count
+        
+        # Tier 1: place types that are themselves keys of the rule table
+        if 'rules' in self.cascade_tiers:
+            for index, place_type in enumerate(place_types):
+                land_use = exact_land_use(place_type)
+                if land_use is not None:
+                    predictions[index], sources[index], tiers[index] = land_use, 'rule-based', 'rule-exact'
+        
+        # Tier 2: cheap linear classifier, accepted only when it is confident
+        remaining = [index for index in range(count) if tiers[index] is None]
+        if remaining and 'linear' in self.cascade_tiers and self.linear_classifier is not None:
+            try:
+                labels, confidences = self.linear_classifier(
+                    [names[index] for index in remaining],
+                    [place_types[index] for index in remaining]
+                )
+                for index, label, confidence in zip(remaining, labels, confidences):
+                    if confidence >= self.linear_confidence_threshold:
+                        predictions[index], sources[index], tiers[index] = label, 'model', 'linear'
+            except Exception as e:
+                print(f"Linear classifier error: {str(e)}")
+        
+        # Tier 3: the LSTM (or the rule-based classifier when it is disabled)
+        remaining = [index for index in range(count) if tiers[index] is None]
+        if remaining:
+            if 'lstm' in self.cascade_tiers:
+                new_predictions, new_sources, new_tiers = predict_neural(
+                    self,
+                    [names[index] for index in remaining],
+                    [place_types[index] for index in remaining],
+                    batch_size
+                )
+            else:
+                new_predictions = self.classify_land_use_batch([names[index] for index in remaining],
+                                                               [place_types[index] for index in remaining])
+                new_sources = ['rule-based'] * len(remaining)
+                new_tiers = ['rule-fallback'] * len(remaining)
+            for index, prediction, source, tier in zip(remaining, new_predictions, new_sources, new_tiers):
+                predictions[index], sources[index], tiers[index] = prediction, source, tier
+        
+        return predictions, sources, tiers
+
+
+def predict_neural(self, names, place_types, batch_size=None):
+        """Run the neural model (with rule-based fallback) over lists of places"""
+        count = len(names)
+        if count == 0:
+            return [], [], []
+            
         try:
             if self.model is None or self.tokenizer is None:
-                prediction = self.classify_land_use(name, place_type)
-                return prediction, 'rule-based'
+                predictions = self.classify_land_use_batch(names, place_types)
+                return predictions, ['rule-based'] * count, ['rule-fallback'] * count
 
-            # Prepare input
-            combined_text = f"{name} {place_type}"
+            keras = lazy_import("tensorflow").keras
             
-            # Convert text to sequence
-            X_sequence = self.tokenizer.texts_to_sequences([combined_text])
-            
-            # Pad sequence to match the training length
+            # Tokenize and pad all inputs at once
+            combined_texts = [f"{name} {place_type}" for name, place_type in zip(names, place_types)]
+            X_sequences = self.tokenizer.texts_to_sequences(combined_texts)
             X_padded = keras.preprocessing.sequence.pad_sequences(
-                X_sequence,
-                maxlen=20,  # Should match the max_sequence_length used in training
+                X_sequences,
+                maxlen=MAX_SEQUENCE_LENGTH,
                 padding='post'
             )
             
-            # Get prediction
-            pred = self.model.predict(X_padded, verbose=0)
-            pred_class = np.argmax(pred[0])
+            # One predict call for the whole result set
+            pred = predict_probabilities(self, X_padded, batch_size)
+            pred_classes = np.argmax(pred, axis=1)
+            confidences = pred[np.arange(count), pred_classes]
             
-            # Get confidence score
-            confidence = float(pred[0][pred_class])
+            class_labels = np.array([self.reverse_mapping.get(i, "Others") for i in range(pred.shape[1])],
+                                    dtype=object)
+            predictions = class_labels[pred_classes]
+            sources = np.full(count, 'model', dtype=object)
+            tiers = np.full(count, 'lstm', dtype=object)
             
-            # Use rule-based fallback if confidence is too low
-            confidence_threshold = 0.5  # Adjust this threshold as needed
-            if confidence < confidence_threshold:
-                prediction = self.classify_land_use(name, place_type)
-                return prediction, 'rule-based'
+            # Use rule-based fallback where confidence is too low
+            low_confidence = np.flatnonzero(confidences < CONFIDENCE_THRESHOLD)
+            for index in low_confidence:
+                predictions[index] = self.classify_land_use(names[index], place_types[index])
+            sources[low_confidence] = 'rule-based'
+            tiers[low_confidence] = 'rule-fallback'
             
-            prediction = self.reverse_mapping.get(pred_class, "Others")
-            return prediction, 'model'
+            return predictions.tolist(), sources.tolist(), tiers.tolist()
         
         except Exception as e:
             print(f"Prediction error: {str(e)}")
-            prediction = self.classify_land_use(name, place_type)
-            return prediction, 'rule-based'
+            predictions = self.classify_land_use_batch(names, place_types)
+            return predictions, ['rule-based'] * count, ['error-fallback'] * count
+
+
+def active_inference_backend(self):
+        """
+        The backend predictions will run on. A TFLite variant that cannot be loaded is
+        reported and the selection is reset to Keras, so cache keys name what actually ran.
+        """
+        if self.inference_backend == 'keras':
+            return 'keras'
+        if get_tflite_classifier(self, self.inference_backend.split('-', 1)[1]) is not None:
+            return self.inference_backend
 
+        print(f"{self.inference_backend} model is unavailable; switching the inference backend to keras")
+        self.inference_backend = 'keras'
+        if hasattr(self, 'backend_selector'):
+            self.backend_selector.set('keras')
+        return 'keras'
 
-def initialize_model(self):
+
+def predict_probabilities(self, X_padded, batch_size=None):
+        """Class probabilities from the selected inference backend (Keras or a TFLite variant)"""
+        if self.inference_backend != 'keras':
+            classifier = get_tflite_classifier(self, self.inference_backend.split('-', 1)[1])
+            if classifier is not None:
+                return classifier.predict(X_padded)
+        # Small batches (interactive edits) skip predict()'s per-call pipeline setup
+        if len(X_padded) <= INTERACTIVE_BATCH_LIMIT and self.interactive_predict is not None:
+            tf = lazy_import("tensorflow")
+            return self.interactive_predict(tf.constant(X_padded, dtype=tf.int32)).numpy()
+        return self.model.predict(X_padded, batch_size=batch_size or self.prediction_batch_size, verbose=0)
+
+
+def build_interactive_predictor(model):
+        """
+        Wrap the model in a tf.function with a fixed (None, MAX_SEQUENCE_LENGTH) int32
+        signature, traced once here so later calls go straight to the compiled graph
+        """
+        tf = lazy_import("tensorflow")
+
+        @tf.function(input_signature=[tf.TensorSpec(shape=(None, MAX_SEQUENCE_LENGTH), dtype=tf.int32)])
+        def interactive_predict(X):
+            return model(X, training=False)
+
+        # Warm-up: tracing and graph optimization happen on this first call
+        interactive_predict(tf.zeros((1, MAX_SEQUENCE_LENGTH), dtype=tf.int32))
+        return interactive_predict
+
+
+def benchmark_inference(self, runs=200):
+        """p50/p99 latency in ms of single-item predictions via the interactive path and via model.predict"""
+        tf = lazy_import("tensorflow")
+        samples = [self.X_test[index % len(self.X_test)][np.newaxis, :].astype(np.int32) for index in range(runs)]
+        paths = {
+            'interactive (tf.function)': lambda X: self.interactive_predict(tf.constant(X)).numpy(),
+            'model.predict': lambda X: self.model.predict(X, verbose=0)
+        }
+
+        results = {}
+        for path, predict in paths.items():
+            timings = []
+            for X in samples:
+                start = time.perf_counter()
+                predict(X)
+                timings.append((time.perf_counter() - start) * 1000)
+            results[path] = (np.percentile(timings, 50), np.percentile(timings, 99))
+        return results
+
+
+def show_inference_benchmark(self):
+        """Run the single-item latency benchmark and show the results"""
+        if self.model is None or self.interactive_predict is None or self.X_test is None or len(self.X_test) == 0:
+            messagebox.showwarning("Warning", "No trained model available")
+            return
+
+        try:
+            results = benchmark_inference(self)
+            lines = [f"{path}: p50 {p50:.3f} ms, p99 {p99:.3f} ms" for path, (p50, p99) in results.items()]
+            messagebox.showinfo("Single-Item Inference Latency", "\n".join(lines))
+        except Exception as e:
+            messagebox.showerror("Error", f"Inference benchmark failed: {str(e)}")
+
+
+def initialize_model(self, force_retrain=False):
+        """Load the saved model for the current data, or start training a new one in the background"""
         try:
             if self.df is None or len(self.df) == 0:
                 print("No data available for model initialization")
                 return
 
+            # Reuse saved artifacts unless the data or rule table changed
+            fingerprint = data_fingerprint(getattr(self, 'data_file', None))
+            artifacts = artifact_path(self.model_artifact_dir, fingerprint)
+            if not force_retrain and load_model_artifacts(self, artifacts):
+                self.model_artifact_path = artifacts
+                self.interactive_predict = build_interactive_predictor(self.model)
+                return
+
+            if training_in_progress(self):
+                print("Model training is already running")
+                return
+
+            # Searches keep being served (rule-based, or by the previous model) while this runs
+            start_training_worker(self, train_model, (self, self.df.copy(), fingerprint, artifacts),
+                                  "Training land-use model in the background; using rule-based predictions")
+
+        except Exception as e:
+            print(f"Model initialization error: {str(e)}")
+
+
+def start_training_worker(self, target, args, status):
+        """Run target(*args, progress) on the background worker; poll_training handles its messages"""
+        self.training_queue = queue.Queue()
+        self.training_thread = threading.Thread(target=target, args=args + (self.training_queue,), daemon=True)
+        self.training_active = True  # cleared by poll_training once it takes the run's final message
+        self.training_thread.start()
+        self.set_status(status)
+        self.root.after(TRAINING_POLL_MS, poll_training, self)
+
+
+def training_in_progress(self):
+        """True from the start of a run until poll_training has applied its result, not just while the thread runs"""
+        return self.training_active
+
+
+def poll_training(self):
+        """Show training progress on the Tk thread and swap in the model once it is ready"""
+        try:
+            while True:
+                kind, payload = self.training_queue.get_nowait()
+                if kind == 'progress':
+                    self.set_status(payload)
+                    continue
+                self.training_active = False
+                if kind == 'done':
+                    apply_trained_model(self, payload)
+                    self.set_status(f"Model ready (test accuracy {self.test_accuracy:.4f})")
+                    break
+                elif kind == 'tfidf':
+                    self.apply_tfidf_classifier(payload)
+                    self.set_status(f"TF-IDF classifier ready (test accuracy {payload['test_accuracy']:.4f})")
+                    break
+                elif kind == 'failed':
+                    self.set_status(f"Model training failed: {payload}")
+                    break
+        except queue.Empty:
+            if self.training_thread.is_alive() or not self.training_queue.empty():
+                self.root.after(TRAINING_POLL_MS, poll_training, self)
+                return
+            # The worker exited without a final message
+            self.training_active = False
+            self.set_status("Model training stopped unexpectedly")
+
+        # Corrections and TF-IDF training requested while this run was busy
+        if self.fine_tune_pending:
+            fine_tune_model(self)
+        if self.tfidf_pending:
+            self.initialize_tfidf_classifier(force_retrain=True)
+
+
+def apply_trained_model(self, trained):
+        """Swap in every trained attribute at once; runs on the Tk thread between searches"""
+        for attribute in TRAINED_ATTRIBUTES:
+            setattr(self, attribute, getattr(trained, attribute))
+
+
+def labelled_training_data(self, df):
+        """Rule-labelled copy of the places plus the logged user corrections, with the name_place text feature"""
+        df['land_use'] = classify_land_use_series(df['name'], df['place_type'])
+
+        # User corrections from the edit dialog are training examples too
+        corrections = load_corrections(self.corrections_file)
+        if corrections:
+            pd = lazy_import("pandas")
+            df = pd.concat([df, pd.DataFrame(corrections, columns=['name', 'place_type', 'land_use'])],
+                           ignore_index=True)
+
+        # A class with a single example breaks the stratified split; it is held back until a second arrives
+        counts = df['land_use'].value_counts()
+        df = df[df['land_use'].map(counts) >= 2].reset_index(drop=True)
+        df['name_place'] = df['name'] + " " + df['place_type'].fillna('')
+        return df
+
+
+def train_model(self, df, fingerprint, artifacts, progress):
+        """
+        Train and save a new model on a copy of the data. Runs on a worker thread:
+        results are built on a separate namespace and handed to the Tk thread via
+        the progress queue, so nothing the GUI reads is modified until the swap.
+        """
+        try:
+            # TensorFlow and scikit-learn are only imported once training is needed
+            keras = lazy_import("tensorflow").keras
+            layers = keras.layers
+            train_test_split = lazy_import("sklearn.model_selection").train_test_split
+            trained = SimpleNamespace(model_artifact_path=artifacts)
+
             # Feature Extraction
-            self.df['land_use'] = self.df.apply(lambda row: self.classify_land_use(row['name'], row['place_type']), axis=1)
-            self.df['name_place'] = self.df['name'] + " " + self.df['place_type'].fillna('')
+            df = labelled_training_data(self, df)
             
             # Convert text to sequences using tokenizer
-            self.tokenizer = keras.preprocessing.text.Tokenizer(num_words=1000)
-            self.tokenizer.fit_on_texts(self.df['name_place'])
-            X_sequences = self.tokenizer.texts_to_sequences(self.df['name_place'])
+            trained.tokenizer = keras.preprocessing.text.Tokenizer(num_words=1000)
+            trained.tokenizer.fit_on_texts(df['name_place'])
+            X_sequences = trained.tokenizer.texts_to_sequences(df['name_place'])
             
             # Pad sequences to ensure uniform length
-            max_sequence_length = 20  # You can adjust this based on your data
+            max_sequence_length = MAX_SEQUENCE_LENGTH
             X_padded = keras.preprocessing.sequence.pad_sequences(
                 X_sequences, 
                 maxlen=max_sequence_length,
                 padding='post'
             )
             
-            # Ensure land_use column exists and has values
-            if 'land_use' not in self.df.columns or self.df['land_use'].isna().all():
-                self.df['land_use'] = self.df.apply(
-                    lambda x: self.classify_land_use(x['name'], x['place_type']), 
-                    axis=1
-                )
-            
             # Get unique land use categories and create label mapping
-            unique_land_uses = sorted(self.df['land_use'].unique())
-            self.label_mapping = {label: idx for idx, label in enumerate(unique_land_uses)}
-            class_counts = self.df['land_use'].value_counts()
+            unique_land_uses = sorted(df['land_use'].unique())
+            trained.label_mapping = {label: idx for idx, label in enumerate(unique_land_uses)}
             
             # Convert labels to numeric values
-            y = np.array([self.label_mapping[label] for label in self.df['land_use']])
+            y = np.array([trained.label_mapping[label] for label in df['land_use']])
             
             # Ensure we have enough samples and more than one class
             if len(y) < 32 or len(unique_land_uses) < 2:
                 print(f"Warning: Insufficient data for training. Samples: {len(y)}, Classes: {len(unique_land_uses)}")
+                progress.put(('failed', "insufficient training data"))
                 return
 
             # Train-test split
-            X_train, self.X_test, y_train, self.y_test = train_test_split(
+            X_train, trained.X_test, y_train, trained.y_test = train_test_split(
                 X_padded, y, 
                 train_size=0.7, 
                 test_size=0.3, 
@@ -99,9 +424,9 @@ def initialize_model(self):
 
             # Define RNN model architecture
             num_classes = len(unique_land_uses)
-            vocab_size = len(self.tokenizer.word_index) + 1  # Add 1 for padding token
+            vocab_size = len(trained.tokenizer.word_index) + 1  # Add 1 for padding token
             
-            self.model = keras.Sequential([
+            model = keras.Sequential([
                 layers.Embedding(vocab_size, 100, input_length=max_sequence_length),
                 layers.Bidirectional(layers.LSTM(128, return_sequences=True)),
                 layers.Dropout(0.3),
@@ -111,17 +436,18 @@ def initialize_model(self):
                 layers.Dropout(0.1),
                 layers.Dense(num_classes, activation='softmax')
             ])
+            trained.model = model
 
             # Compile model
-            self.model.compile(
+            model.compile(
                 optimizer='adam',
                 loss='sparse_categorical_crossentropy',
                 metrics=['accuracy']
             )
 
             # Save initial model architecture summary
-            self.model_summary = []
-            self.model.summary(print_fn=lambda x: self.model_summary.append(x))
+            trained.model_summary = []
+            model.summary(print_fn=lambda x: trained.model_summary.append(x))
 
             # Use class weights to handle imbalanced data
             class_weights = {}
@@ -137,29 +463,164 @@ def initialize_model(self):
                 restore_best_weights=True
             )
 
-            self.history = self.model.fit(
+            # Publish per-epoch metrics for the status bar
+            epochs = 2
+            report_progress = keras.callbacks.LambdaCallback(
+                on_epoch_end=lambda epoch, logs: progress.put((
+                    'progress',
+                    f"Training model: epoch {epoch + 1}/{epochs}, "
+                    f"loss {logs.get('loss', 0):.4f}, accuracy {logs.get('accuracy', 0):.4f}"
+                ))
+            )
+
+            training_start = time.perf_counter()
+            trained.history = model.fit(
                 X_train,
                 y_train,
-                epochs=2,
+                epochs=epochs,
                 batch_size=32,
                 validation_split=0.2,
-                callbacks=[early_stopping],
+                callbacks=[early_stopping, report_progress],
                 class_weight=class_weights,
                 verbose=1
             )
 
+            trained.training_seconds = time.perf_counter() - training_start
+
             # Evaluate model
-            self.test_loss, self.test_accuracy = self.model.evaluate(self.X_test, self.y_test, verbose=0)
+            trained.test_loss, trained.test_accuracy = model.evaluate(trained.X_test, trained.y_test, verbose=0)
             print(f"\nModel Training Completed Successfully!")
-            print(f"Test Accuracy: {self.test_accuracy:.4f}")
+            print(f"Test Accuracy: {trained.test_accuracy:.4f}")
 
             # Generate predictions for confusion matrix
-            y_pred = self.model.predict(self.X_test)
-            self.y_pred_classes = np.argmax(y_pred, axis=1)
+            y_pred = model.predict(trained.X_test)
+            trained.y_pred_classes = np.argmax(y_pred, axis=1)
 
             # Save reverse mapping for later use
-            self.reverse_mapping = {v: k for k, v in self.label_mapping.items()}
+            trained.reverse_mapping = {v: k for k, v in trained.label_mapping.items()}
+
+            # Persist everything so the next startup can skip training
+            progress.put(('progress', "Saving trained model"))
+            trained.model_version = f"{fingerprint}-{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}"
+            save_model_artifacts(trained, artifacts)
+            export_tflite_models(trained)
+            trained.interactive_predict = build_interactive_predictor(model)
+
+            progress.put(('done', trained))
 
         except Exception as e:
             print(f"Model initialization error: {str(e)}")
-            self.model = None
\ No newline at end of file
+            progress.put(('failed', str(e)))
+
+
+def has_new_vocabulary(tokenizer, texts):
+        """True when any word in texts is missing from the tokenizer's vocabulary, or beyond its num_words cut-off"""
+        keras = lazy_import("tensorflow").keras
+        limit = tokenizer.num_words or float('inf')
+        for text in texts:
+            words = keras.preprocessing.text.text_to_word_sequence(
+                text, filters=tokenizer.filters, lower=tokenizer.lower, split=tokenizer.split
+            )
+            # texts_to_sequences drops words ranked at or past num_words
+            if any(tokenizer.word_index.get(word, limit) >= limit for word in words):
+                return True
+        return False
+
+
+def fine_tune_model(self):
+        """
+        Fine-tune the current model on the logged corrections in the background.
+        Corrections that need new words or a new class fall back to a full retrain,
+        since the tokenizer and output layer cannot grow in place.
+        """
+        corrections = load_corrections(self.corrections_file)
+        if not corrections:
+            return
+
+        if training_in_progress(self):
+            self.fine_tune_pending = True
+            return
+        self.fine_tune_pending = False
+
+        texts = [f"{correction['name']} {correction['place_type'] or ''}" for correction in corrections]
+        if (self.model is None or
+                any(correction['land_use'] not in self.label_mapping for correction in corrections) or
+                has_new_vocabulary(self.tokenizer, texts)):
+            print("Corrections need a new vocabulary or class; retraining from scratch")
+            initialize_model(self, force_retrain=True)
+            return
+
+        # Snapshot taken on the Tk thread, so the worker never reads attributes mid-swap
+        base = SimpleNamespace(**{attribute: getattr(self, attribute) for attribute in TRAINED_ATTRIBUTES})
+        start_training_worker(self, fine_tune, (self, base, corrections, self.df.copy()),
+                              f"Fine-tuning model on {len(corrections)} corrections")
+
+
+def fine_tune(self, base, corrections, df, progress):
+        """Worker: update a copy of the model on corrections mixed with a replay sample of the original data"""
+        try:
+            keras = lazy_import("tensorflow").keras
+            trained = SimpleNamespace(**vars(base))
+
+            model = keras.models.clone_model(base.model)
+            model.set_weights(base.model.get_weights())
+            model.compile(
+                optimizer=keras.optimizers.Adam(learning_rate=FINE_TUNE_LEARNING_RATE),
+                loss='sparse_categorical_crossentropy',
+                metrics=['accuracy']
+            )
+            trained.model = model
+
+            # Replayed rows keep the classes the corrections do not mention from drifting
+            replay = df.sample(n=min(REPLAY_SAMPLE_SIZE, len(df)))
+            replay_labels = classify_land_use_series(replay['name'], replay['place_type']).tolist()
+            replay_texts = list(replay['name'] + " " + replay['place_type'].fillna(''))
+            replay = [(text, label) for text, label in zip(replay_texts, replay_labels)
+                      if label in base.label_mapping]
+
+            texts = [text for text, _ in replay] + \
+                    [f"{correction['name']} {correction['place_type'] or ''}" for correction in corrections]
+            y = np.array([base.label_mapping[label] for _, label in replay] +
+                         [base.label_mapping[correction['land_use']] for correction in corrections])
+            weights = np.concatenate([np.ones(len(replay)), np.full(len(corrections), CORRECTION_WEIGHT)])
+
+            X_padded = keras.preprocessing.sequence.pad_sequences(
+                base.tokenizer.texts_to_sequences(texts),
+                maxlen=MAX_SEQUENCE_LENGTH,
+                padding='post'
+            )
+
+            report_progress = keras.callbacks.LambdaCallback(
+                on_epoch_end=lambda epoch, logs: progress.put((
+                    'progress',
+                    f"Fine-tuning model: epoch {epoch + 1}/{FINE_TUNE_EPOCHS}, "
+                    f"loss {logs.get('loss', 0):.4f}, accuracy {logs.get('accuracy', 0):.4f}"
+                ))
+            )
+            trained.history = model.fit(
+                X_padded,
+                y,
+                sample_weight=weights,
+                epochs=FINE_TUNE_EPOCHS,
+                batch_size=32,
+                shuffle=True,
+                callbacks=[report_progress],
+                verbose=0
+            )
+
+            trained.test_loss, trained.test_accuracy = model.evaluate(base.X_test, base.y_test, verbose=0)
+            trained.y_pred_classes = np.argmax(model.predict(base.X_test, verbose=0), axis=1)
+            print(f"Fine-tuned on {len(corrections)} corrections, test accuracy {trained.test_accuracy:.4f}")
+
+            # Same artifact directory, new version id: the next startup loads the fine-tuned model
+            fingerprint = base.model_version.split('-')[0]
+            trained.model_version = f"{fingerprint}-ft{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}"
+            save_model_artifacts(trained, trained.model_artifact_path)
+            export_tflite_models(trained)
+            trained.interactive_predict = build_interactive_predictor(model)
+
+            progress.put(('done', trained))
+
+        except Exception as e:
+            print(f"Fine-tuning error: {str(e)}")
+            progress.put(('failed', str(e)))
@@ -0,0 +1,123 @@
+import os
+import json
+import hashlib
+import datetime
+from types import SimpleNamespace
+import numpy as np
+from rule_based import LAND_USE_MAPPING, EXACT_LAND_USES
+from lazy_imports import lazy_import
+
+# Bump when the artifact layout or the training pipeline changes
+ARTIFACT_VERSION = 2
+DEFAULT_ARTIFACT_DIR = "model_artifacts"
+
+
+def data_fingerprint(data_file):
+        """Hash of the training data file and the rule table that labels it"""
+        digest = hashlib.sha256(f"v{ARTIFACT_VERSION}".encode())
+        if data_file and os.path.exists(data_file):
+            with open(data_file, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+        digest.update(json.dumps(list(LAND_USE_MAPPING.items())).encode())
+        return digest.hexdigest()[:16]
+
+
+def rules_fingerprint():
+        """Hash of the artifact version and the rule table; changes whenever rule results can change"""
+        digest = hashlib.sha256(f"v{ARTIFACT_VERSION}".encode())
+        digest.update(json.dumps(list(LAND_USE_MAPPING.items())).encode())
+        digest.update(json.dumps(list(EXACT_LAND_USES.items())).encode())
+        return digest.hexdigest()[:16]
+
+
+def artifact_path(artifact_dir, fingerprint):
+        """Versioned directory holding the artifacts trained on one data fingerprint"""
+        return os.path.join(artifact_dir, f"v{ARTIFACT_VERSION}_{fingerprint}")
+
+
+def save_model_artifacts(self, path):
+        """Save model, tokenizer, label mapping, test split and history for reuse at startup"""
+        try:
+            os.makedirs(path, exist_ok=True)
+            self.model.save(os.path.join(path, "model.keras"))
+
+            with open(os.path.join(path, "tokenizer.json"), 'w', encoding='utf-8') as f:
+                f.write(self.tokenizer.to_json())
+
+            with open(os.path.join(path, "labels.json"), 'w', encoding='utf-8') as f:
+                json.dump(self.label_mapping, f, indent=4)
+
+            np.savez_compressed(
+                os.path.join(path, "test_split.npz"),
+                X_test=self.X_test,
+                y_test=self.y_test,
+                y_pred_classes=self.y_pred_classes
+            )
+
+            history = {key: [float(value) for value in values]
+                       for key, values in self.history.history.items()}
+            with open(os.path.join(path, "history.json"), 'w', encoding='utf-8') as f:
+                json.dump(history, f, indent=4)
+
+            # Metadata is written last; its presence marks a complete artifact set
+            with open(os.path.join(path, "meta.json"), 'w', encoding='utf-8') as f:
+                json.dump({
+                    'artifact_version': ARTIFACT_VERSION,
+                    'model_version': self.model_version,
+                    'trained_at': datetime.datetime.now().isoformat(),
+                    'test_loss': float(self.test_loss),
+                    'test_accuracy': float(self.test_accuracy),
+                    'model_summary': self.model_summary,
+                    'training_seconds': getattr(self, 'training_seconds', None)
+                }, f, indent=4)
+
+            print(f"Model artifacts saved to {path}")
+        except Exception as e:
+            print(f"Error saving model artifacts: {str(e)}")
+
+
+def load_model_artifacts(self, path):
+        """Load artifacts saved by save_model_artifacts; returns True on success"""
+        meta_file = os.path.join(path, "meta.json")
+        if not os.path.exists(meta_file):
+            return False
+
+        try:
+            keras = lazy_import("tensorflow").keras
+
+            with open(meta_file, encoding='utf-8') as f:
+                meta = json.load(f)
+
+            model = keras.models.load_model(os.path.join(path, "model.keras"))
+
+            with open(os.path.join(path, "tokenizer.json"), encoding='utf-8') as f:
+                tokenizer = keras.preprocessing.text.tokenizer_from_json(f.read())
+
+            with open(os.path.join(path, "labels.json"), encoding='utf-8') as f:
+                label_mapping = json.load(f)
+
+            test_split = np.load(os.path.join(path, "test_split.npz"))
+
+            with open(os.path.join(path, "history.json"), encoding='utf-8') as f:
+                history = json.load(f)
+
+            self.model = model
+            self.tokenizer = tokenizer
+            self.label_mapping = label_mapping
+            self.reverse_mapping = {v: k for k, v in label_mapping.items()}
+            self.X_test = test_split['X_test']
+            self.y_test = test_split['y_test']
+            self.y_pred_classes = test_split['y_pred_classes']
+            self.history = SimpleNamespace(history=history)  # same shape as keras' History
+            self.test_loss = meta['test_loss']
+            self.test_accuracy = meta['test_accuracy']
+            self.model_summary = meta['model_summary']
+            self.training_seconds = meta.get('training_seconds')
+            self.model_version = meta['model_version']
+
+            print(f"Loaded trained model from {path} (test accuracy {self.test_accuracy:.4f})")
+            return True
+        except Exception as e:
+            print(f"Error loading model artifacts from {path}: {str(e)}")
+            return False
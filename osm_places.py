@@ -1,9 +1,11 @@
-import requests
-import rasterio
-from geopy.distance import geodesic
+import numpy as np
 from tkinter import messagebox
+from lazy_imports import lazy_import
+from geo import distances_km
+from place_store import PlaceStore
 
 def query_osm_places(self):
+        requests = lazy_import("requests")
         try:
             overpass_url = "http://overpass-api.de/api/interpreter"
             radius_km = self.current_radius / 1000  # Convert to kilometers
@@ -25,85 +27,68 @@ def query_osm_places(self):
             response.raise_for_status()
             data = response.json()
             
-            osm_places = []
+            names = []
+            place_types = []
+            lats = []
+            lngs = []
             self.osm_prediction_sources = {'model': 0, 'rule-based': 0}
+            self.osm_tier_counts = {}
 
-            # Open DEM file once for all places
-            with rasterio.open(self.dem_file) as src:
-                for element in data.get('elements', []):
-                    if 'tags' in element:
-                        try:
-                            tags = element['tags']
-                            place_type = tags.get('amenity') or tags.get('building') or 'unspecified'
-                            name = tags.get('name', 'Unnamed')
-                            
-                            # Get coordinates
-                            if element['type'] == 'node':
-                                lat, lng = element['lat'], element['lon']
-                            else:  # way or relation
-                                if 'center' in element:
-                                    lat, lng = element['center']['lat'], element['center']['lon']
-                                else:
-                                    continue
-                            
-                            # Calculate distance
-                            distance = geodesic(
-                                (self.user_lat, self.user_lng),
-                                (lat, lng)
-                            ).km
+            for element in data.get('elements', []):
+                if 'tags' in element:
+                    try:
+                        tags = element['tags']
+                        place_type = tags.get('amenity') or tags.get('building') or 'unspecified'
+                        name = tags.get('name', 'Unnamed')
+                        
+                        # Get coordinates
+                        if element['type'] == 'node':
+                            lat, lng = element['lat'], element['lon']
+                        else:  # way or relation
+                            if 'center' in element:
+                                lat, lng = element['center']['lat'], element['center']['lon']
+                            else:
+                                continue
 
-                            # Get prediction and source
-                            predicted_land_use, source = self.predict_land_use(name, place_type)
-                            self.osm_prediction_sources[source] += 1
+                        lats.append(float(lat))
+                        lngs.append(float(lng))
+                        names.append(name)
+                        place_types.append(place_type)
+                    except Exception as e:
+                        print(f"Error processing OSM element: {str(e)}")
+                        continue
 
-                            # Get elevation data
-                            try:
-                                # Transform coordinates to pixel coordinates
-                                row, col = src.index(lng, lat)
-                                
-                                # Check if coordinates are within bounds
-                                if 0 <= row < src.height and 0 <= col < src.width:
-                                    elevation = float(src.read(1)[row, col])
-                                    
-                                    # Handle nodata values
-                                    if elevation == src.nodata:
-                                        elevation = 0
-                                        elevation_class = 'Unknown'
-                                    else:
-                                        elevation_class = self.classify_elevation(elevation)
-                                else:
-                                    elevation = 0
-                                    elevation_class = 'Unknown'
-                            except Exception as e:
-                                print(f"Error reading elevation for coordinates ({lat}, {lng}): {str(e)}")
-                                elevation = 0
-                                elevation_class = 'Unknown'
-                            
-                            osm_places.append({
-                                'id': len(osm_places) + 1,
-                                'name': name,
-                                'lat': lat,
-                                'lng': lng,
-                                'place_type': place_type,
-                                'land_use': predicted_land_use,
-                                'prediction_source': source,
-                                'distance': round(distance, 2),
-                                'elevation': elevation,
-                                'elevation_class': elevation_class
-                            })
-                        except Exception as e:
-                            print(f"Error processing OSM element: {str(e)}")
-                            continue
+            # Distances to all elements in one array operation
+            distances = distances_km(self.user_lat, self.user_lng, lats, lngs, radius_km=radius_km)
+
+            # Classify all elements with one batched prediction
+            predictions, sources = self.predict_land_use_batch(names, place_types,
+                                                               tier_counts=self.osm_tier_counts)
+            for source in sources:
+                self.osm_prediction_sources[source] += 1
+
+            osm_places = PlaceStore.from_columns(
+                id=np.arange(1, len(names) + 1),
+                name=names,
+                lat=lats,
+                lng=lngs,
+                place_type=place_types,
+                land_use=predictions,
+                prediction_source=sources,
+                distance=np.round(distances, 2),
+                elevation=0.0,
+                elevation_class='Unknown'
+            )
+
+            # Get elevation data for all elements with one batched DEM pass
+            self.add_elevations(osm_places)
 
             self.osm_total = sum(self.osm_prediction_sources.values())
             return osm_places
             
         except requests.exceptions.RequestException as e:
             messagebox.showerror("Error", f"Failed to fetch OSM data: {str(e)}")
-            return []
-        except rasterio.errors.RasterioError as e:
-            messagebox.showerror("Error", f"Failed to read DEM file: {str(e)}")
-            return []
+            return PlaceStore()
         except Exception as e:
             messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
-            return []
\ No newline at end of file
+            return PlaceStore()
\ No newline at end of file
@@ -0,0 +1,84 @@
+import numpy as np
+from lazy_imports import lazy_import
+
+PLACE_COLUMNS = ('id', 'name', 'lat', 'lng', 'place_type', 'land_use', 'prediction_source',
+                 'distance', 'elevation', 'elevation_class')
+# Low-cardinality text columns, stored as pandas categoricals
+CATEGORICAL_COLUMNS = ('place_type', 'land_use', 'prediction_source', 'elevation_class')
+
+
+class PlaceStore:
+    """
+    Columnar search results: a single DataFrame built once per search that the table,
+    charts, maps and exports all read. Iterating yields one plain dict per row.
+    """
+
+    def __init__(self, frame=None):
+        self.frame = frame  # None until the first search, so startup does not need pandas
+
+    @classmethod
+    def from_columns(cls, **columns):
+        """Build a store from equal-length column sequences (scalars are broadcast)"""
+        pd = lazy_import("pandas")
+        frame = pd.DataFrame({column: columns[column] for column in PLACE_COLUMNS},
+                             index=pd.RangeIndex(len(columns['id'])))
+        for column in CATEGORICAL_COLUMNS:
+            frame[column] = frame[column].astype('category')
+        return cls(frame)
+
+    @classmethod
+    def concat(cls, stores):
+        """One store holding the rows of several, in order"""
+        frames = [store.frame for store in stores if len(store)]
+        if not frames:
+            return cls()
+        pd = lazy_import("pandas")
+        # Differing category sets would otherwise fall back to object columns
+        frame = pd.concat([frame.astype({column: object for column in CATEGORICAL_COLUMNS}) for frame in frames],
+                          ignore_index=True)
+        for column in CATEGORICAL_COLUMNS:
+            frame[column] = frame[column].astype('category')
+        return cls(frame)
+
+    def __len__(self):
+        return 0 if self.frame is None else len(self.frame)
+
+    def __iter__(self):
+        if not len(self):
+            return iter(())
+        columns = [self.frame[column].tolist() for column in PLACE_COLUMNS]
+        return (dict(zip(PLACE_COLUMNS, values)) for values in zip(*columns))
+
+    def row(self, position):
+        """Dict of one row, by position"""
+        return dict(zip(PLACE_COLUMNS, self.frame.iloc[position][list(PLACE_COLUMNS)].tolist()))
+
+    def column(self, name):
+        """One column as a NumPy array"""
+        if not len(self):
+            return np.empty(0)
+        return self.frame[name].to_numpy()
+
+    def filter(self, mask):
+        """Store with the rows where mask is True; categories that no longer occur are dropped"""
+        if not len(self):
+            return self
+        frame = self.frame[np.asarray(mask, dtype=bool)].reset_index(drop=True)
+        for column in CATEGORICAL_COLUMNS:
+            frame[column] = frame[column].cat.remove_unused_categories()
+        return PlaceStore(frame)
+
+    def set_column(self, name, values):
+        """Replace a whole column, keeping categorical columns categorical"""
+        self.frame[name] = values
+        if name in CATEGORICAL_COLUMNS:
+            self.frame[name] = self.frame[name].astype('category')
+
+    def update_row(self, position, **values):
+        """Set fields of one row, adding new categories as needed"""
+        for name, value in values.items():
+            if name in CATEGORICAL_COLUMNS and value not in self.frame[name].cat.categories:
+                self.frame[name] = self.frame[name].cat.add_categories([value])
+            self.frame.iloc[position, self.frame.columns.get_loc(name)] = value
+            if name in CATEGORICAL_COLUMNS:
+                self.frame[name] = self.frame[name].cat.remove_unused_categories()
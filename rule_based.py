@@ -1,3 +1,7 @@
+import re
+from functools import lru_cache
+
+
 def get_marker_color(land_use):
         """Return color for markers based on land use type"""
         color_mapping = {
@@ -21,124 +25,200 @@ def get_marker_color(land_use):
         return color_mapping.get(land_use, "gray")
 
 
+# Land use mapping dictionary; earlier keys take precedence when several match
+LAND_USE_MAPPING = {
+    "school": "Educational",
+    "university": "Educational",
+    "city_hall": "Educational",
+    "college": "Educational",
+    "hospital": "Healthcare",
+    "doctor": "Healthcare",
+    "physiotherapist": "Healthcare",
+    "dentist": "Healthcare",
+    "clinic": "Healthcare",
+    "pharmacy": "Healthcare",
+    "residential": "Residential",
+    "residence": "Residential",
+    "apartment": "Residential",
+    "house": "Residential",
+    "park": "Recreational",
+    "toilet": "Recreational",
+    "stadium": "Recreational",
+    "playground": "Recreational",
+    "amusement_park": "Recreational",
+    "shelter": "Recreational",
+    "restaurant": "Commercial",
+    "marketplace": "Commercial",
+    "fast_food": "Commercial",
+    "mall": "Commercial",
+    "store": "Commercial",
+    "showroom": "Commercial",
+    "supermarket": "Commercial",
+    "gym": "Commercial",
+    "hardware": "Commercial",
+    "fuel": "Commercial",
+    "car": "Commercial",
+    "store": "Commercial",
+    "lawyer": "Commercial",
+    "cloth": "Commercial",
+    "electronic": "Commercial",
+    "fabric": "Commercial",
+    "cafe": "Commercial",
+    "office": "Commercial",
+    "bank": "Commercial",
+    "theatre": "Commercial",
+    "theater": "Commercial",
+    "florist": "Commercial",
+    "fast_food": "Commercial",
+    "cinema": "Commercial",
+    "movie_theater": "Commercial",
+    "meal_delivery": "Commercial",
+    "movie_rental": "Commercial",
+    "lodging": "Commercial",
+    "hostel": "Commercial",
+    "library": "Educational",
+    "hotel": "Commercial",
+    "atm": "Commercial",
+    "aquarium": "Recreational",
+    "bench": "Recreational",
+    "zoo": "Recreational",
+    "art_gallery": "Cultural",
+    "bakery": "Commercial",
+    "bicycle_store": "Commercial",
+    "book_store": "Commercial",
+    "beauty_salon": "Commercial",
+    "hair_care": "Commercial",
+    "accounting": "Commercial",
+    "real_estate_agency": "Commercial",
+    "insurance_agency": "Commercial",
+    "shipping": "Commercial",
+    "laundry": "Commercial",
+    "casino": "Commercial",
+    "cassino": "Commercial",
+    "pvt ltd": "Commercial",
+    "spa": "Commercial",
+    "pub": "Commercial",
+    "car_dealer": "Commercial",
+    "jewel": "Commercial",
+    "jewelry": "Commercial",
+    "art_work": "Commercial",
+    "bar": "Commercial",
+    "night_club": "Commercial",
+    "music": "Commercial",
+    "airport": "Infrastructure",
+    "museum": "Infrastructure",
+    "industrial": "Industrial",
+    "agricultural": "Agricultural",
+    "government_office": "Government",
+    "townhall": "Government",
+    "police": "Government",
+    "Department": "Government",
+    "post_box": "Government",
+    "embassy": "Government",
+    "church": "Religious",
+    "synagogue": "Religious",
+    "place_of_worship": "Religious",
+    "mosque": "Religious",
+    "temple": "Religious",
+    "train_station": "Transport",
+    "bus_station": "Transport",
+    "hotel": "Tourism",
+    "travel_agency": "Tourism",
+    "resort": "Tourism",
+    "historical_landmark": "Tourism",
+    "mixed_use": "Mixed-Use",
+    "green_space": "Green Spaces"
+}
+
+
+def rule_trie_pattern(keys):
+        """
+        Regex matching the longest key that starts at the current position, built as
+        a character trie so each position costs one branch per character, not one per key
+        """
+        trie = {}
+        for key in keys:
+            node = trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node[''] = True  # a key ends here
+
+        def build(node):
+            branches = [re.escape(char) + build(child) for char, child in node.items() if char != '']
+            if not branches:
+                return ''
+            body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+            # Greedy optional: prefer extending to a longer key, else stop at this one
+            return f'(?:{body})?' if '' in node else body
+
+        return build(trie)
+
+
+# The zero-width lookahead reports the longest key at every position, overlaps
+# included. Every other key starting at that position is a prefix of it, so
+# RULE_PRECEDENCE maps each key to the best table position among its prefixes,
+# which preserves the table's first-match-wins order.
+RULE_KEYS = list(LAND_USE_MAPPING)
+RULE_PATTERN = re.compile("(?=(" + rule_trie_pattern(RULE_KEYS) + "))")
+RULE_PRECEDENCE = {
+    key: min(priority for priority, prefix in enumerate(RULE_KEYS) if key.startswith(prefix))
+    for key in RULE_KEYS
+}
+
+
+@lru_cache(maxsize=65536)
+def match_rule(text):
+        """Value of the first rule-table key occurring anywhere in text, or None"""
+        keys = RULE_PATTERN.findall(text)
+        if not keys:
+            return None
+        return LAND_USE_MAPPING[RULE_KEYS[min(RULE_PRECEDENCE[key] for key in keys)]]
+
+
+# What classify_land_use gives each rule key as a place_type; an earlier key can be a
+# substring of it (government_office -> "office"), so this is not always LAND_USE_MAPPING[key]
+EXACT_LAND_USES = {key: match_rule(key) for key in LAND_USE_MAPPING}
+
+
+def exact_land_use(place_type):
+        """Land use of a place_type that is itself a key of the rule table, otherwise None"""
+        return EXACT_LAND_USES.get(str(place_type).strip().lower())
+
+
 def classify_land_use(name, place_type):
-        # Land use mapping dictionary
-        land_use_mapping = {
-                "school": "Educational",
-                "university": "Educational",
-                "city_hall": "Educational",
-                "college": "Educational",
-                "hospital": "Healthcare",
-                "doctor": "Healthcare",
-                "physiotherapist": "Healthcare",
-                "dentist": "Healthcare",
-                "clinic": "Healthcare",
-                "pharmacy": "Healthcare",
-                "residential": "Residential",
-                "residence": "Residential",
-                "apartment": "Residential",
-                "house": "Residential",
-                "park": "Recreational",
-                "toilet": "Recreational",
-                "stadium": "Recreational",
-                "playground": "Recreational",
-                "amusement_park": "Recreational",
-                "shelter": "Recreational",
-                "restaurant": "Commercial",
-                "marketplace": "Commercial",
-                "fast_food": "Commercial",
-                "mall": "Commercial",
-                "store": "Commercial",
-                "showroom": "Commercial",
-                "supermarket": "Commercial",
-                "gym": "Commercial",
-                "hardware": "Commercial",
-                "fuel": "Commercial",
-                "car": "Commercial",
-                "store": "Commercial",
-                "lawyer": "Commercial",
-                "cloth": "Commercial",
-                "electronic": "Commercial",
-                "fabric": "Commercial",
-                "cafe": "Commercial",
-                "office": "Commercial",
-                "bank": "Commercial",
-                "theatre": "Commercial",
-                "theater": "Commercial",
-                "florist": "Commercial",
-                "fast_food": "Commercial",
-                "cinema": "Commercial",
-                "movie_theater": "Commercial",
-                "meal_delivery": "Commercial",
-                "movie_rental": "Commercial",
-                "lodging": "Commercial",
-                "hostel": "Commercial",
-                "library": "Educational",
-                "hotel": "Commercial",
-                "atm": "Commercial",
-                "aquarium": "Recreational",
-                "bench": "Recreational",
-                "zoo": "Recreational",
-                "art_gallery": "Cultural",
-                "bakery": "Commercial",
-                "bicycle_store": "Commercial",
-                "book_store": "Commercial",
-                "beauty_salon": "Commercial",
-                "hair_care": "Commercial",
-                "accounting": "Commercial",
-                "real_estate_agency": "Commercial",
-                "insurance_agency": "Commercial",
-                "shipping": "Commercial",
-                "laundry": "Commercial",
-                "casino": "Commercial",
-                "cassino": "Commercial",
-                "pvt ltd": "Commercial",
-                "spa": "Commercial",
-                "pub": "Commercial",
-                "car_dealer": "Commercial",
-                "jewel": "Commercial",
-                "jewelry": "Commercial",
-                "art_work": "Commercial",
-                "bar": "Commercial",
-                "night_club": "Commercial",
-                "music": "Commercial",
-                "airport": "Infrastructure",
-                "museum": "Infrastructure",
-                "industrial": "Industrial",
-                "agricultural": "Agricultural",
-                "government_office": "Government",
-                "townhall": "Government",
-                "police": "Government",
-                "Department": "Government",
-                "post_box": "Government",
-                "embassy": "Government",
-                "church": "Religious",
-                "synagogue": "Religious",
-                "place_of_worship": "Religious",
-                "mosque": "Religious",
-                "temple": "Religious",
-                "train_station": "Transport",
-                "bus_station": "Transport",
-                "hotel": "Tourism",
-                "travel_agency": "Tourism",
-                "resort": "Tourism",
-                "historical_landmark": "Tourism",
-                "mixed_use": "Mixed-Use",
-                "green_space": "Green Spaces"
-            }
-        
-        name = str(name).lower()
-        place_type = str(place_type).lower()
-               # Try matching place_type first
-        for key, value in land_use_mapping.items():
-            if key in place_type:
-                return value
-
-                       
-                # Try matching name if place_type didn't match
-        for key, value in land_use_mapping.items():
-            if key in name:
-                return value
-                        
-            return "Others"
-     
\ No newline at end of file
+        """Rule-based land use: the first rule key found in place_type, then in name, else 'Others'"""
+        return (match_rule(str(place_type).lower()) or
+                match_rule(str(name).lower()) or
+                "Others")
+
+
+def classify_land_use_series(names, place_types):
+        """
+        Column-wise classify_land_use for pandas Series: lowercase once with the string
+        accessor, run the rules once per distinct value, place_type first, then name
+        """
+        # map(str) like classify_land_use's str(); astype(str) keeps NaN as a missing value in pandas 3
+        place_types = place_types.map(str).str.lower()
+        names = names.map(str).str.lower()
+
+        land_uses = place_types.map({value: match_rule(value) for value in place_types.unique()})
+        unmatched = land_uses.isna()
+        if unmatched.any():
+            unmatched_names = names[unmatched]
+            land_uses[unmatched] = unmatched_names.map(
+                {value: match_rule(value) for value in unmatched_names.unique()}
+            )
+        return land_uses.mask(land_uses.isna(), "Others")
+
+
+def classify_land_use_batch(names, place_types):
+        """classify_land_use over lists or Series; each distinct (name, place_type) pair is matched once"""
+        results = {}
+        land_uses = []
+        for name, place_type in zip(names, place_types):
+            key = (name, place_type)
+            land_use = results.get(key)
+            if land_use is None:
+                land_use = results[key] = classify_land_use(name, place_type)
+            land_uses.append(land_use)
+        return land_uses
@@ -1,13 +1,11 @@
 from tkinter import ttk, messagebox
 import datetime
 import os
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.metrics import confusion_matrix
-from sklearn.metrics import classification_report
 import webbrowser
-import pandas as pd
 from tkinter import filedialog
+from lazy_imports import lazy_import
+from model import CASCADE_TIERS
+from tfidf_classifier import compare_classifier_backends
 
 def save_results(self):
         """Save current results to a file"""
@@ -39,7 +37,7 @@ def save_results(self):
                 return
                 
             # Convert results to DataFrame
-            df = pd.DataFrame(self.filtered_places)
+            df = self.filtered_places.frame
             
             # Save based on file extension
             if filename.endswith('.csv'):
@@ -62,7 +60,7 @@ def export_data(self, format_type):
             
         try:
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            df = pd.DataFrame(self.filtered_places)
+            df = self.filtered_places.frame
             
             file_types = {
                 "csv": ("CSV files", "*.csv"),
@@ -172,6 +170,8 @@ def export_all_maps(self):
 
 def export_analysis_report(self):
         """Generate and export a comprehensive analysis report"""
+        plt = lazy_import("matplotlib.pyplot")
+        sns = lazy_import("seaborn")
         if not self.filtered_places:
             messagebox.showwarning("Warning", "No data to analyze")
             return
@@ -184,7 +184,7 @@ def export_analysis_report(self):
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = os.path.join(self.analysis_folder, f"analysis_report_{timestamp}.html")
             
-            df = pd.DataFrame(self.filtered_places)
+            df = self.filtered_places.frame
             
             # Create visualizations
             plt.figure(figsize=(10, 6))
@@ -271,6 +271,9 @@ def export_analysis_report(self):
 
 def export_model_report(self):
         """Generate and export a comprehensive model analysis report"""
+        plt = lazy_import("matplotlib.pyplot")
+        sns = lazy_import("seaborn")
+        metrics = lazy_import("sklearn.metrics")
         if not hasattr(self, 'model') or self.model is None:
             messagebox.showwarning("Warning", "No trained model available")
             return
@@ -308,7 +311,7 @@ def export_model_report(self):
             plt.close()
             
             # Generate confusion matrix
-            cm = confusion_matrix(self.y_test, self.y_pred_classes)
+            cm = metrics.confusion_matrix(self.y_test, self.y_pred_classes)
             plt.figure(figsize=(10, 8))
             sns.heatmap(cm, annot=True, fmt='d', cmap='Blues',
                         xticklabels=[self.reverse_mapping[i] for i in range(len(self.reverse_mapping))],
@@ -322,7 +325,7 @@ def export_model_report(self):
             plt.close()
             
             # Generate classification report
-            class_report = classification_report(
+            class_report = metrics.classification_report(
                 self.y_test,
                 self.y_pred_classes,
                 target_names=[self.reverse_mapping[i] for i in range(len(self.reverse_mapping))]
@@ -375,6 +378,26 @@ def export_model_report(self):
                 </div>
                 """
             
+            # Share of the places each cascade tier resolved
+            osm_tiers = getattr(self, 'osm_tier_counts', {})
+            google_tiers = getattr(self, 'google_tier_counts', {})
+            tier_rows = ""
+            for tier in CASCADE_TIERS:
+                osm_count = osm_tiers.get(tier, 0)
+                google_count = google_tiers.get(tier, 0)
+                total_count = osm_count + google_count
+                total_percent = (total_count/total_predictions)*100 if total_predictions > 0 else 0
+                tier_rows += f"<tr><td>{tier}</td><td>{osm_count}</td><td>{google_count}</td><td>{total_count} ({total_percent:.1f}%)</td></tr>"
+            
+            # Side-by-side comparison of the classifier backends
+            backend_rows = ""
+            for backend, accuracy, training_seconds, latency in compare_classifier_backends(self):
+                training_time = f"{training_seconds:.2f} s" if training_seconds is not None else "N/A"
+                backend_rows += (f"<tr><td>{backend}</td><td>{accuracy:.4f}</td><td>{training_time}</td>"
+                                 f"<td>{latency * 1e6:.1f} us ({1 / latency if latency else 0:,.0f} items/s)</td></tr>")
+            
+            cache_stats = self.prediction_cache.stats()
+            
             # Generate HTML report
             html_content = f"""
             <html>
@@ -433,6 +456,27 @@ def export_model_report(self):
                     <p><strong>ML Model predictions:</strong> {total_model} ({total_model_percent:.1f}%)</p>
                     <p><strong>Rule-based predictions:</strong> {total_rule_based} ({total_rule_based_percent:.1f}%)</p>
                 </div>
+                <div class="metrics">
+                    <h3>Classifier Backends</h3>
+                    <p><strong>Selected backend:</strong> {self.classifier_backend}</p>
+                    <table>
+                        <tr><th>Backend</th><th>Test Accuracy</th><th>Training Time</th><th>Inference Latency (per item)</th></tr>
+                        {backend_rows}
+                    </table>
+                </div>
+                <div class="metrics">
+                    <h3>Classification Cascade</h3>
+                    <p><strong>Enabled tiers:</strong> {', '.join(self.cascade_tiers)}</p>
+                    <table>
+                        <tr><th>Tier</th><th>OSM</th><th>Google Places</th><th>Total</th></tr>
+                        {tier_rows}
+                    </table>
+                </div>
+                <div class="metrics">
+                    <h3>Prediction Cache</h3>
+                    <p><strong>Cached predictions:</strong> {cache_stats['size']} / {cache_stats['maxsize']}</p>
+                    <p><strong>Hits / misses:</strong> {cache_stats['hits']} / {cache_stats['misses']} ({cache_stats['hit_rate']*100:.1f}% hit rate)</p>
+                </div>
                 <div class="section">
                     <h2>Classification Report</h2>
                     <pre>{class_report}</pre>
@@ -1,17 +1,22 @@
 from tkinter import messagebox
-import pandas as pd
 import tkinter as tk
 from tkinter import ttk
-import seaborn as sns
+from lazy_imports import lazy_import
+from rule_based import LAND_USE_MAPPING
+from corrections import log_correction
 
 
 def update_chart(self, event=None):
         """Fixed chart updating function"""
-        if not self.filtered_places or not hasattr(self, 'ax'):
+        if not self.filtered_places:
             return
-            
+        
+        # The chart canvas (and matplotlib) are created on first use
+        self.setup_chart_canvas()
+        sns = lazy_import("seaborn")
+        
         self.ax.clear()
-        df = pd.DataFrame(self.filtered_places)
+        df = self.filtered_places.frame
         
         selected_chart = self.chart_type.get()
         
@@ -52,6 +57,7 @@ def edit_place(self):
             
         item_values = self.table.item(selected_item[0])['values']
         place_id = int(item_values[0])
+        row = int(selected_item[0])  # table rows are keyed by their position in self.filtered_places
         
         # Create edit dialog
         edit_window = tk.Toplevel(self.root)
@@ -68,30 +74,40 @@ def edit_place(self):
         type_entry.insert(0, item_values[2])
         type_entry.grid(row=1, column=1, padx=5, pady=5)
         
+        # Picking a different land use records a correction for fine-tuning; only classes
+        # the model already knows (or the rules produce, before a model exists) are offered
+        ttk.Label(edit_window, text="Land Use:").grid(row=2, column=0, padx=5, pady=5)
+        land_uses = sorted(getattr(self, 'label_mapping', None) or set(LAND_USE_MAPPING.values()) | {"Others"})
+        land_use_box = ttk.Combobox(edit_window, values=land_uses, state="readonly")
+        land_use_box.set(item_values[3])
+        land_use_box.grid(row=2, column=1, padx=5, pady=5)
+        
         def save_changes():
-            for place in self.filtered_places:
-                if place['id'] == place_id:
-                    place['name'] = name_entry.get()
-                    place['place_type'] = type_entry.get()
-                    place['land_use'] = self.predict_land_use(
-                        place['name'],
-                        place['place_type']
-                    )
-                    place.get('prediction_source', 'N/A'), 
-                    break
-                    
+            name = name_entry.get()
+            place_type = type_entry.get()
+            predicted_land_use, source = self.predict_land_use(name, place_type)
+            land_use = land_use_box.get().strip()
+            if land_use and land_use != str(item_values[3]) and land_use != predicted_land_use:
+                source = 'user'
+                log_correction(self.corrections_file, name, place_type, land_use)
+                self.fine_tune_model()
+            else:
+                land_use = predicted_land_use
+            
+            self.filtered_places.update_row(row, name=name, place_type=place_type,
+                                            land_use=land_use, prediction_source=source)
             self.update_table(self.filtered_places)
             edit_window.destroy()
             
         ttk.Button(edit_window, text="Save", command=save_changes).grid(
-            row=2, column=0, columnspan=2, pady=10
+            row=3, column=0, columnspan=2, pady=10
         )
 
 def update_statistics(self):
         if not self.filtered_places:
             return
             
-        df = pd.DataFrame(self.filtered_places)
+        df = self.filtered_places.frame
         
         stats = {
             'Total Places': len(df),
@@ -111,10 +127,10 @@ def on_search_table(self, *args):
         for row in self.table.get_children():
             self.table.delete(row)
             
-        for place in self.filtered_places:
+        for row, place in enumerate(self.filtered_places):
             if any(search_term in str(value).lower() 
                   for value in place.values()):
-                self.table.insert("", "end", values=(
+                self.table.insert("", "end", iid=str(row), values=(
                     place['id'],
                     place['name'],
                     place['place_type'],
@@ -129,8 +145,8 @@ def update_table(self, places):
         for row in self.table.get_children():
             self.table.delete(row)
             
-        for place in places:
-            self.table.insert("", "end", values=(
+        for row, place in enumerate(places):
+            self.table.insert("", "end", iid=str(row), values=(
                 place['id'],
                 place['name'],
                 place['place_type'],
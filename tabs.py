@@ -1,7 +1,8 @@
 from tkinter import ttk
 import tkinter as tk
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
+from lazy_imports import lazy_import
+from tflite_backend import INFERENCE_BACKENDS
+from tfidf_classifier import CLASSIFIER_BACKENDS
 
 def setup_export_tab(self):
         frame_export = ttk.LabelFrame(self.tab_export, text="Export Options")
@@ -17,6 +18,30 @@ def setup_export_tab(self):
                    command=self.export_all_maps).pack(pady=5)
         ttk.Button(frame_export, text="Export Model Evaluation", 
                command=self.export_model_report).pack(pady=5)
+        ttk.Button(frame_export, text="Retrain Model", 
+               command=self.retrain_model).pack(pady=5)
+        
+        # Classifier backend selector
+        ttk.Label(frame_export, text="Classifier Backend:").pack(pady=5)
+        self.classifier_selector = ttk.Combobox(frame_export, values=list(CLASSIFIER_BACKENDS), state="readonly")
+        self.classifier_selector.set(self.classifier_backend)
+        self.classifier_selector.bind("<<ComboboxSelected>>",
+                                      lambda event: self.set_classifier_backend(self.classifier_selector.get()))
+        self.classifier_selector.pack(pady=5)
+        
+        # Inference backend selector
+        ttk.Label(frame_export, text="Inference Backend:").pack(pady=5)
+        self.backend_selector = ttk.Combobox(frame_export, values=list(INFERENCE_BACKENDS), state="readonly")
+        self.backend_selector.set(self.inference_backend)
+        self.backend_selector.bind("<<ComboboxSelected>>",
+                                   lambda event: self.set_inference_backend(self.backend_selector.get()))
+        self.backend_selector.pack(pady=5)
+        ttk.Button(frame_export, text="Check TFLite Parity", 
+               command=self.show_tflite_parity).pack(pady=5)
+        ttk.Button(frame_export, text="Benchmark Inference", 
+               command=self.show_inference_benchmark).pack(pady=5)
+        ttk.Button(frame_export, text="Startup Report", 
+               command=self.show_startup_report).pack(pady=5)
 
 
 def setup_analysis_tab(self):
@@ -40,9 +65,19 @@ def setup_analysis_tab(self):
         self.chart_type.pack(pady=5)
         self.chart_type.bind("<<ComboboxSelected>>", self.update_chart)
         
-        # Canvas for matplotlib
+        # Canvas for matplotlib is created with the first chart, see setup_chart_canvas
+        self.frame_charts = frame_charts
+        self.fig = self.ax = self.canvas = None
+
+def setup_chart_canvas(self):
+        """Create the matplotlib canvas on first use so matplotlib stays out of startup"""
+        if self.canvas is not None:
+            return
+        plt = lazy_import("matplotlib.pyplot")
+        FigureCanvasTkAgg = lazy_import("matplotlib.backends.backend_tkagg").FigureCanvasTkAgg
+        
         self.fig, self.ax = plt.subplots(figsize=(10, 6))
-        self.canvas = FigureCanvasTkAgg(self.fig, master=frame_charts)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.frame_charts)
         self.canvas.get_tk_widget().pack(fill="both", expand=True)
 
 def setup_visualization_tab(self):
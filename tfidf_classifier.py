@@ -0,0 +1,161 @@
+import os
+import time
+import datetime
+import numpy as np
+from lazy_imports import lazy_import
+from model import labelled_training_data, start_training_worker, training_in_progress
+from model_store import data_fingerprint, artifact_path
+
+TFIDF_ARTIFACT = "tfidf_linear.joblib"
+
+# Classifier backends selectable in the app, as the cascade tiers each one runs
+CLASSIFIER_BACKENDS = {
+    'cascade': ('rules', 'linear', 'lstm'),
+    'bilstm': ('lstm',),  # every place goes through the network; rules only back up low confidence
+    'tfidf': ('rules', 'linear')
+}
+
+
+class TfidfLinearClassifier:
+    """Character n-gram TF-IDF features with a linear model; called as the cascade's linear tier"""
+
+    def __init__(self, vectorizer, label_encoder, classifier, version):
+        self.vectorizer = vectorizer
+        self.label_encoder = label_encoder
+        self.classifier = classifier
+        self.version = version
+
+    def __call__(self, names, place_types):
+        """Return (labels, confidences) for lists of places"""
+        texts = [f"{name} {place_type or ''}" for name, place_type in zip(names, place_types)]
+        if not texts:
+            return [], []
+        probabilities = self.classifier.predict_proba(self.vectorizer.transform(texts))
+        best = np.argmax(probabilities, axis=1)
+        labels = self.label_encoder.classes_[self.classifier.classes_[best]]
+        return labels.tolist(), probabilities[np.arange(len(texts)), best].tolist()
+
+
+def train_tfidf_classifier(self, df, fingerprint):
+        """Fit the TF-IDF + logistic regression backend on the same labels and split as the BiLSTM"""
+        feature_extraction = lazy_import("sklearn.feature_extraction.text")
+        linear_model = lazy_import("sklearn.linear_model")
+        preprocessing = lazy_import("sklearn.preprocessing")
+        train_test_split = lazy_import("sklearn.model_selection").train_test_split
+
+        df = labelled_training_data(self, df)
+        texts = df['name_place'].tolist()
+        label_encoder = preprocessing.LabelEncoder()
+        y = label_encoder.fit_transform(df['land_use'])
+
+        if len(y) < 32 or len(label_encoder.classes_) < 2:
+            print(f"Warning: Insufficient data for the TF-IDF classifier. Samples: {len(y)}")
+            return None
+
+        # Identical split parameters to the BiLSTM, so test accuracies are comparable
+        texts_train, texts_test, y_train, y_test = train_test_split(
+            texts, y,
+            train_size=0.7,
+            test_size=0.3,
+            random_state=42,
+            stratify=y
+        )
+
+        start = time.perf_counter()
+        vectorizer = feature_extraction.TfidfVectorizer(analyzer='char_wb', ngram_range=(2, 4),
+                                                        sublinear_tf=True, dtype=np.float32)
+        X_train = vectorizer.fit_transform(texts_train)
+        classifier = linear_model.LogisticRegression(max_iter=1000, class_weight='balanced')
+        classifier.fit(X_train, y_train)
+        training_seconds = time.perf_counter() - start
+
+        test_accuracy = float(np.mean(classifier.predict(vectorizer.transform(texts_test)) == y_test))
+        version = f"tfidf-{fingerprint}-{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}"
+        print(f"TF-IDF classifier trained in {training_seconds:.2f}s, test accuracy {test_accuracy:.4f}")
+
+        return {
+            'vectorizer': vectorizer,
+            'label_encoder': label_encoder,
+            'classifier': classifier,
+            'version': version,
+            'test_accuracy': test_accuracy,
+            'training_seconds': training_seconds,
+            'test_texts': texts_test,
+            'test_labels': y_test
+        }
+
+
+def initialize_tfidf_classifier(self, force_retrain=False):
+        """Load the saved TF-IDF backend for the current data, or start training a new one in the background"""
+        try:
+            if self.df is None or len(self.df) == 0:
+                return
+
+            joblib = lazy_import("joblib")
+            fingerprint = data_fingerprint(getattr(self, 'data_file', None))
+            path = os.path.join(artifact_path(self.model_artifact_dir, fingerprint), TFIDF_ARTIFACT)
+
+            if not force_retrain and os.path.exists(path):
+                try:
+                    apply_tfidf_classifier(self, joblib.load(path))
+                    return
+                except Exception as e:
+                    print(f"Error loading TF-IDF classifier from {path}: {str(e)}")
+
+            # One training run at a time; poll_training starts this one when the current run is applied
+            if training_in_progress(self):
+                self.tfidf_pending = True
+                return
+            self.tfidf_pending = False
+            start_training_worker(self, train_tfidf_worker, (self, self.df.copy(), fingerprint, path),
+                                  "Training TF-IDF classifier in the background")
+
+        except Exception as e:
+            print(f"TF-IDF classifier initialization error: {str(e)}")
+
+
+def train_tfidf_worker(self, df, fingerprint, path, progress):
+        """Worker: fit and save the TF-IDF backend, then hand it to the Tk thread via the progress queue"""
+        try:
+            bundle = train_tfidf_classifier(self, df, fingerprint)
+            if bundle is None:
+                progress.put(('failed', "insufficient data for the TF-IDF classifier"))
+                return
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            lazy_import("joblib").dump(bundle, path)
+            progress.put(('tfidf', bundle))
+
+        except Exception as e:
+            print(f"TF-IDF classifier training error: {str(e)}")
+            progress.put(('failed', str(e)))
+
+
+def apply_tfidf_classifier(self, bundle):
+        """Swap in a trained TF-IDF backend; runs on the Tk thread"""
+        self.tfidf = bundle['vectorizer']
+        self.label_encoder = bundle['label_encoder']
+        self.tfidf_metrics = bundle
+        self.linear_classifier = TfidfLinearClassifier(
+            bundle['vectorizer'], bundle['label_encoder'], bundle['classifier'], bundle['version']
+        )
+
+
+def compare_classifier_backends(self):
+        """Test accuracy, training time and per-item inference latency of the BiLSTM and TF-IDF backends"""
+        rows = []
+
+        if self.model is not None and self.X_test is not None and len(self.X_test):
+            start = time.perf_counter()
+            self.model.predict(self.X_test, batch_size=self.prediction_batch_size, verbose=0)
+            latency = (time.perf_counter() - start) / len(self.X_test)
+            rows.append(('BiLSTM', self.test_accuracy, getattr(self, 'training_seconds', None), latency))
+
+        if self.linear_classifier is not None and getattr(self, 'tfidf_metrics', None):
+            test_texts = self.tfidf_metrics['test_texts']
+            start = time.perf_counter()
+            self.linear_classifier.classifier.predict_proba(self.tfidf.transform(test_texts))
+            latency = (time.perf_counter() - start) / max(len(test_texts), 1)
+            rows.append(('TF-IDF + linear', self.tfidf_metrics['test_accuracy'],
+                         self.tfidf_metrics['training_seconds'], latency))
+
+        return rows
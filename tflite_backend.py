@@ -0,0 +1,144 @@
+import os
+import numpy as np
+from tkinter import messagebox
+from lazy_imports import lazy_import
+
+# Selectable inference backends; the TFLite ones run a converted copy of the BiLSTM
+INFERENCE_BACKENDS = ('keras', 'tflite-float16', 'tflite-int8')
+TFLITE_VARIANTS = ('float16', 'int8')
+
+
+def tflite_model_path(artifact_path, variant):
+        return os.path.join(artifact_path, f"model_{variant}.tflite")
+
+
+def export_tflite_models(self, variants=TFLITE_VARIANTS):
+        """
+        Convert the trained Keras model into TFLite flatbuffers next to the other
+        artifacts: 'float16' stores float16 weights, 'int8' uses dynamic-range
+        int8 quantization. Returns {variant: path} for the successful conversions.
+        """
+        tf = lazy_import("tensorflow")
+        exported = {}
+
+        for variant in variants:
+            try:
+                converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
+                converter.optimizations = [tf.lite.Optimize.DEFAULT]
+                if variant == 'float16':
+                    converter.target_spec.supported_types = [tf.float16]
+                # Bidirectional LSTMs may need TF ops that have no TFLite builtin
+                converter.target_spec.supported_ops = [
+                    tf.lite.OpsSet.TFLITE_BUILTINS,
+                    tf.lite.OpsSet.SELECT_TF_OPS
+                ]
+                flatbuffer = converter.convert()
+
+                os.makedirs(self.model_artifact_path, exist_ok=True)
+                path = tflite_model_path(self.model_artifact_path, variant)
+                with open(path, 'wb') as f:
+                    f.write(flatbuffer)
+                exported[variant] = path
+                print(f"Exported {variant} TFLite model ({len(flatbuffer) / 1024:.0f} KB) to {path}")
+            except Exception as e:
+                print(f"TFLite {variant} export failed: {str(e)}")
+
+        return exported
+
+
+class TFLiteClassifier:
+    """Runs a TFLite flatbuffer through the interpreter with a pre-allocated (batch_size, sequence_length) input"""
+
+    def __init__(self, model_path, batch_size=256, sequence_length=20):
+        tf = lazy_import("tensorflow")
+        self.interpreter = tf.lite.Interpreter(model_path=model_path)
+        input_details = self.interpreter.get_input_details()[0]
+
+        self.batch_size = batch_size
+        self.input_index = input_details['index']
+        self.interpreter.resize_tensor_input(self.input_index, [batch_size, sequence_length])
+        self.interpreter.allocate_tensors()
+        self.output_index = self.interpreter.get_output_details()[0]['index']
+        self._input = np.zeros((batch_size, sequence_length), dtype=input_details['dtype'])
+
+    def predict(self, X_padded):
+        """Class probabilities for padded sequences, computed batch_size rows at a time"""
+        outputs = []
+        for start in range(0, len(X_padded), self.batch_size):
+            chunk = X_padded[start:start + self.batch_size]
+            rows = len(chunk)
+
+            # The last partial batch is zero-padded; only its real rows are kept
+            self._input[:rows] = chunk
+            self._input[rows:] = 0
+            self.interpreter.set_tensor(self.input_index, self._input)
+            self.interpreter.invoke()
+            outputs.append(self.interpreter.get_tensor(self.output_index)[:rows].copy())
+
+        if not outputs:
+            num_classes = self.interpreter.get_output_details()[0]['shape'][-1]
+            return np.zeros((0, num_classes), dtype=np.float32)
+        return np.concatenate(outputs)
+
+
+def get_tflite_classifier(self, variant):
+        """Interpreter for the current model version, exporting the flatbuffer if it is missing"""
+        key = (self.model_version, variant)
+        classifier = self.tflite_classifiers.get(key)
+        if classifier is not None:
+            return classifier
+
+        path = tflite_model_path(self.model_artifact_path, variant)
+        if not os.path.exists(path) and variant not in export_tflite_models(self, [variant]):
+            return None
+
+        classifier = TFLiteClassifier(path, batch_size=self.prediction_batch_size)
+        self.tflite_classifiers = {key: classifier for key, classifier in self.tflite_classifiers.items()
+                                   if key[0] == self.model_version}
+        self.tflite_classifiers[key] = classifier
+        return classifier
+
+
+def check_tflite_parity(self, variant):
+        """Compare a TFLite variant with the Keras model on X_test"""
+        classifier = get_tflite_classifier(self, variant)
+        if classifier is None:
+            return None
+
+        keras_probs = self.model.predict(self.X_test, batch_size=self.prediction_batch_size, verbose=0)
+        tflite_probs = classifier.predict(self.X_test)
+        keras_classes = np.argmax(keras_probs, axis=1)
+        tflite_classes = np.argmax(tflite_probs, axis=1)
+
+        return {
+            'variant': variant,
+            'agreement': float(np.mean(keras_classes == tflite_classes)),
+            'keras_accuracy': float(np.mean(keras_classes == self.y_test)),
+            'tflite_accuracy': float(np.mean(tflite_classes == self.y_test)),
+            'max_probability_diff': float(np.max(np.abs(keras_probs - tflite_probs))) if len(keras_probs) else 0.0,
+            'model_size_kb': os.path.getsize(tflite_model_path(self.model_artifact_path, variant)) / 1024
+        }
+
+
+def show_tflite_parity(self):
+        """Run the parity check for every TFLite variant and show the results"""
+        if self.model is None or self.X_test is None:
+            messagebox.showwarning("Warning", "No trained model available")
+            return
+
+        try:
+            lines = []
+            for variant in TFLITE_VARIANTS:
+                result = check_tflite_parity(self, variant)
+                if result is None:
+                    lines.append(f"{variant}: conversion failed")
+                    continue
+                lines.append(
+                    f"{variant}: {result['agreement']*100:.2f}% agreement with Keras, "
+                    f"accuracy {result['tflite_accuracy']:.4f} vs {result['keras_accuracy']:.4f}, "
+                    f"max prob. diff {result['max_probability_diff']:.4f}, "
+                    f"{result['model_size_kb']:.0f} KB"
+                )
+            messagebox.showinfo("TFLite Parity Check", "\n".join(lines))
+        except Exception as e:
+            messagebox.showerror("Error", f"TFLite parity check failed: {str(e)}")